@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark: real-time factor of the transcription engines on local audio files.
+
+Usage:
+    python benchmarks/bench_engines.py episode.mp3 [more.mp3 ...] [--model base]
+        [--engines whisper faster-whisper] [--compute-type int8] [--threads 0] [--seconds 300]
+
+Each file is decoded once to 16 kHz PCM (needs ffmpeg on PATH) and trimmed to
+--seconds, then transcribed by every engine. The real-time factor is
+transcription time divided by audio duration; below 1.0 is faster than real
+time. Model load time is reported separately and not counted in the RTF.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config import Config
+from src.core.model_registry import ModelRegistry
+from src.core.stream_decoder import SAMPLE_RATE, StreamingDecoder
+from src.core.transcription_engines import ENGINES, create_engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--model", default=Config.WHISPER_MODEL)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--compute-type", default=Config.TRANSCRIPTION_COMPUTE_TYPE)
+    parser.add_argument("--threads", type=int, default=Config.TRANSCRIPTION_CPU_THREADS,
+                        help="Intra-op threads (0 for the library default)")
+    parser.add_argument("--seconds", type=float, default=300, help="Audio per file (0 for all of it)")
+    args = parser.parse_args()
+
+    Config.TRANSCRIPTION_COMPUTE_TYPE = args.compute_type
+    Config.TRANSCRIPTION_CPU_THREADS = args.threads
+
+    decoder = StreamingDecoder()
+    clips = []
+    for path in args.audio:
+        audio = decoder.decode_file(path).audio
+        if args.seconds:
+            audio = audio[:int(args.seconds * SAMPLE_RATE)]
+        clips.append((os.path.basename(path), audio))
+
+    # A private registry, so idle unloading never interferes with a run
+    registry = ModelRegistry(idle_seconds=0, max_resident_bytes=0)
+    for engine_name in args.engines:
+        engine = create_engine(engine_name, args.model, registry)
+        start = time.perf_counter()
+        engine.load()
+        load_seconds = time.perf_counter() - start
+        print(f"{engine_name} ({args.model}): loaded in {load_seconds:.1f}s")
+
+        total_audio = total_time = 0.0
+        for name, audio in clips:
+            duration = len(audio) / SAMPLE_RATE
+            start = time.perf_counter()
+            result = engine.transcribe(audio)
+            elapsed = time.perf_counter() - start
+            total_audio += duration
+            total_time += elapsed
+            print(f"  {name}: {duration:.0f}s audio in {elapsed:.1f}s, RTF {elapsed / duration:.3f}, "
+                  f"{len(result['segments'])} segments, {len(result['text'].split())} words")
+
+        print(f"  overall RTF: {total_time / total_audio:.3f}")
+        registry.unload(engine.registry_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: fast tag scanner vs. full BeautifulSoup parse for episode metadata.
+
+Usage:
+    python benchmarks/bench_metadata_scan.py [saved_page.html ...] [--size-kb 400] [--repeat 20]
+
+Without page arguments, the fixtures in benchmarks/fixtures/ are used. These
+are synthetic: a hand-written episode header in Apple Podcasts markup, padded
+to --size-kb with generated shelf markup, standing in for the several hundred
+KB of related-episode lockups and scripts real pages carry below the fold.
+Timings on them show the shape of the speedup, not real-page numbers; pass
+saved real pages on the command line (benchmarked as-is) for those.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.metadata_extractor import MetadataExtractor
+from src.core.page_snapshot import PageSnapshot
+
+
+FIXTURE_FOLDER = os.path.join(os.path.dirname(__file__), "fixtures")
+
+FILLER_BLOCK = (
+    '<div class="shelf"><ul class="shelf-grid">'
+    + ''.join(
+        '<li class="shelf-grid__list-item"><div class="episode" data-testid="episode-lockup">'
+        '<a href="/us/podcast/episode-{0}/id1000000000?i={0}" class="link-action">'
+        '<span class="episode-details__title">Related episode {0}</span>'
+        '<p class="multiline-clamp">A short summary of another episode with a few words in it.</p>'
+        '</a></div></li>'.format(n)
+        for n in range(20)
+    )
+    + '</ul></div>\n'
+)
+
+
+def load_pages(paths, size_kb):
+    """Load saved pages; pad bundled fixtures to a realistic size."""
+    pages = []
+    if paths:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_FOLDER, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        filler = ""
+        while len(text) + len(filler) < size_kb * 1024:
+            filler += FILLER_BLOCK
+        pages.append((os.path.basename(path), text.replace("<!-- FILLER -->", filler)))
+    return pages
+
+
+def full_parse_metadata(html_text):
+    """The previous path: one html.parser DOM for every field."""
+    soup = BeautifulSoup(html_text, "html.parser")
+    items = []
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string)
+        except (TypeError, json.JSONDecodeError):
+            continue
+        items.extend(data if isinstance(data, list) else [data])
+    title_elem = soup.select_one('span[data-testid="episode-lockup-title"], span.episode-details__title-text')
+    og_title = soup.find("meta", property="og:title")
+    return items, title_elem, og_title
+
+
+def fast_metadata(extractor, url, html_text):
+    """The new path: tag scan, DOM only when needed."""
+    return extractor.extract_from_page(PageSnapshot(url, html_text))
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="Saved episode page HTML files")
+    parser.add_argument("--size-kb", type=int, default=400, help="Padded size for bundled fixtures")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    extractor = MetadataExtractor()
+    for name, html_text in load_pages(args.pages, args.size_kb):
+        snapshot = PageSnapshot("fixture", html_text)
+        full = time_call(lambda: full_parse_metadata(html_text), args.repeat)
+        fast = time_call(lambda: fast_metadata(extractor, "fixture", html_text), args.repeat)
+        print(f"{name} ({len(html_text) / 1024:.0f} KB)")
+        print(f"  full html.parser DOM: {full * 1000:8.2f} ms")
+        print(f"  tag scanner:          {fast * 1000:8.2f} ms")
+        print(f"  speedup:              {full / fast:8.1f}x")
+        print(f"  scanned {snapshot.scan.scanned_chars / len(html_text):.1%} of page, "
+              f"stopped early: {snapshot.scan.stopped_early}")
+        print(f"  result: {fast_metadata(extractor, 'fixture', html_text)['episode_title']!r}")
+
+
+if __name__ == "__main__":
+    main()
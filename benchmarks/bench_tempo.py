@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark: word error rate and real-time factor of tempo-compressed transcription.
+
+Usage:
+    python benchmarks/bench_tempo.py corpus_dir [--tempos 1.0 1.25 1.5] [--model base]
+        [--engine whisper] [--profile balanced] [--seconds 0]
+
+The corpus directory holds audio files (.mp3, .m4a, .wav, ...) each with a
+reference transcript of the same name and a .txt extension. Every file is
+decoded once to 16 kHz PCM (needs ffmpeg on PATH), then sped up to each tempo
+and transcribed. RTF counts both the time stretch and the transcription,
+against the original duration. WER is word-level edit distance to the
+reference after lowercasing and stripping punctuation.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config import Config
+from src.core.decode_profiles import DECODE_PROFILES, get_decode_profile
+from src.core.model_registry import ModelRegistry
+from src.core.stream_decoder import SAMPLE_RATE, StreamingDecoder
+from src.core.tempo import time_stretch
+from src.core.transcription_engines import ENGINES, create_engine
+
+AUDIO_EXTENSIONS = {".mp3", ".m4a", ".wav", ".flac", ".ogg", ".opus"}
+
+
+def normalize_words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: List[str], hypothesis: List[str]) -> int:
+    """Word-level Levenshtein distance (substitutions + insertions + deletions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="Directory of audio files with matching .txt references")
+    parser.add_argument("--tempos", nargs="+", type=float, default=[1.0, 1.25, 1.5])
+    parser.add_argument("--model", default=Config.WHISPER_MODEL)
+    parser.add_argument("--engine", default=Config.TRANSCRIPTION_ENGINE, choices=list(ENGINES))
+    parser.add_argument("--profile", default=Config.DECODE_PROFILE, choices=list(DECODE_PROFILES))
+    parser.add_argument("--seconds", type=float, default=0, help="Audio per file (0 for all of it)")
+    args = parser.parse_args()
+
+    decoder = StreamingDecoder()
+    clips = []
+    for name in sorted(os.listdir(args.corpus)):
+        stem, extension = os.path.splitext(name)
+        reference_path = os.path.join(args.corpus, f"{stem}.txt")
+        if extension.lower() not in AUDIO_EXTENSIONS or not os.path.exists(reference_path):
+            continue
+        audio = decoder.decode_file(os.path.join(args.corpus, name)).audio
+        if args.seconds:
+            audio = audio[:int(args.seconds * SAMPLE_RATE)]
+        with open(reference_path, "r", encoding="utf-8") as f:
+            clips.append((name, audio, normalize_words(f.read())))
+    if not clips:
+        parser.error(f"No audio files with .txt references in {args.corpus}")
+
+    # A private registry, so idle unloading never interferes with a run
+    registry = ModelRegistry(idle_seconds=0, max_resident_bytes=0)
+    engine = create_engine(args.engine, args.model, registry)
+    options = engine.decode_options(get_decode_profile(args.profile))
+    engine.load()
+    print(f"{args.engine} ({args.model}, {args.profile}) on {len(clips)} files, "
+          f"{sum(len(audio) for _, audio, _ in clips) / SAMPLE_RATE:.0f}s of audio")
+
+    baseline_rtf = None
+    for tempo in args.tempos:
+        total_audio = total_time = 0.0
+        total_errors = total_words = 0
+        for name, audio, reference in clips:
+            duration = len(audio) / SAMPLE_RATE
+            start = time.perf_counter()
+            result = engine.transcribe(time_stretch(audio, tempo), **options)
+            elapsed = time.perf_counter() - start
+            errors = word_errors(reference, normalize_words(result["text"]))
+            total_audio += duration
+            total_time += elapsed
+            total_errors += errors
+            total_words += len(reference)
+            print(f"  {tempo:g}x {name}: RTF {elapsed / duration:.3f}, WER {errors / max(len(reference), 1):.1%}")
+
+        rtf = total_time / total_audio
+        baseline_rtf = baseline_rtf or rtf
+        print(f"{tempo:g}x: RTF {rtf:.3f} ({baseline_rtf / rtf:.2f}x vs {args.tempos[0]:g}x), "
+              f"WER {total_errors / max(total_words, 1):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Content-addressed cache of downloaded episode audio."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Optional
+
+from .config import Config
+
+
+def file_content_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """Keeps downloaded audio so re-processing an episode skips the download.
+
+    Files are stored once per content hash and looked up by enclosure URL plus
+    ETag/Content-Length. Files handed out by lookup()/add() are reference
+    counted until release(); referenced files are never evicted.
+    """
+
+    def __init__(self, cache_folder: str = None, max_bytes: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Directory holding cached audio and its index
+            max_bytes: Size budget; least recently used unreferenced files are evicted
+        """
+        self.cache_folder = cache_folder or Config.AUDIO_CACHE_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else Config.AUDIO_CACHE_MAX_BYTES
+        self._lock = threading.RLock()
+        self._refcounts: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "evicted": 0}
+        os.makedirs(self.cache_folder, exist_ok=True)
+        self._index_path = os.path.join(self.cache_folder, "index.json")
+
+    def source_key(self, url: str, etag: Optional[str] = None, content_length: Optional[int] = None) -> str:
+        """Key identifying one version of a remote file."""
+        return hashlib.sha256(f"{url}|{etag or ''}|{content_length or ''}".encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str, etag: Optional[str] = None, content_length: Optional[int] = None) -> Optional[str]:
+        """
+        Find a cached copy of a remote file and take a reference to it.
+
+        Args:
+            url: Enclosure URL as published (before redirects)
+            etag: ETag reported by the server
+            content_length: Content-Length reported by the server
+
+        Returns:
+            Local path of the cached file, or None on a miss
+        """
+        with self._lock:
+            index = self._load_index()
+            content_hash = index["keys"].get(self.source_key(url, etag, content_length))
+            entry = index["entries"].get(content_hash) if content_hash else None
+
+            if not entry or not os.path.exists(entry["path"]):
+                self._stats["misses"] += 1
+                return None
+
+            entry["last_used"] = time.time()
+            self._save_index(index)
+            self._stats["hits"] += 1
+            return self._acquire(entry["path"])
+
+    def add(self, file_path: str, url: str, etag: Optional[str] = None,
+            content_length: Optional[int] = None) -> str:
+        """
+        Move a downloaded file into the cache and take a reference to it.
+
+        A file whose content is already cached (e.g. the same episode behind
+        a different tracking URL) is dropped in favour of the existing copy.
+
+        Args:
+            file_path: Freshly downloaded file
+            url: Enclosure URL it was downloaded from
+            etag: ETag reported by the server
+            content_length: Content-Length reported by the server
+
+        Returns:
+            Path of the cached file
+        """
+        content_hash = file_content_hash(file_path)
+        extension = os.path.splitext(file_path)[1] or ".mp3"
+        cached_path = os.path.join(self.cache_folder, f"{content_hash}{extension}")
+
+        with self._lock:
+            index = self._load_index()
+            if os.path.exists(cached_path):
+                os.remove(file_path)
+            else:
+                shutil.move(file_path, cached_path)
+
+            index["entries"][content_hash] = {
+                "path": cached_path,
+                "size": os.path.getsize(cached_path),
+                "last_used": time.time()
+            }
+            index["keys"][self.source_key(url, etag, content_length)] = content_hash
+            self._save_index(index)
+            path = self._acquire(cached_path)
+            self.evict()
+            return path
+
+    def release(self, path: str) -> None:
+        """Drop a reference taken by lookup() or add()."""
+        with self._lock:
+            count = self._refcounts.get(path, 0) - 1
+            if count > 0:
+                self._refcounts[path] = count
+            else:
+                self._refcounts.pop(path, None)
+
+    def owns(self, path: str) -> bool:
+        """Whether a path lives inside the cache folder."""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.cache_folder)
+
+    def evict(self) -> None:
+        """Remove least recently used unreferenced files until within the size budget."""
+        with self._lock:
+            index = self._load_index()
+            total = sum(entry["size"] for entry in index["entries"].values())
+            by_age = sorted(index["entries"].items(), key=lambda item: item[1]["last_used"])
+
+            for content_hash, entry in by_age:
+                if total <= self.max_bytes:
+                    break
+                if self._refcounts.get(entry["path"]):
+                    continue
+                try:
+                    os.remove(entry["path"])
+                except OSError:
+                    pass
+                total -= entry["size"]
+                del index["entries"][content_hash]
+                self._stats["evicted"] += 1
+
+            index["keys"] = {
+                key: content_hash for key, content_hash in index["keys"].items()
+                if content_hash in index["entries"]
+            }
+            self._save_index(index)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and cache size."""
+        with self._lock:
+            index = self._load_index()
+            stats = dict(self._stats)
+            stats["files"] = len(index["entries"])
+            stats["bytes"] = sum(entry["size"] for entry in index["entries"].values())
+            stats["referenced"] = len(self._refcounts)
+            return stats
+
+    def _acquire(self, path: str) -> str:
+        self._refcounts[path] = self._refcounts.get(path, 0) + 1
+        return path
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"entries": {}, "keys": {}}
+
+    def _save_index(self, index: Dict) -> None:
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+
+
+_shared_cache: Optional[AudioCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Get the process-wide audio cache, so references are shared by every source."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = AudioCache()
+        return _shared_cache
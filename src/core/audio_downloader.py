@@ -1,19 +1,46 @@
 """Audio downloader for podcast episodes."""
 
 import os
-import re
 import requests
-from typing import Optional
-from mutagen.easyid3 import EasyID3
-from mutagen.mp3 import MP3
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .http_client import HttpClient, get_http_client
+from .http_cache import HttpCache, get_http_cache
+from .range_downloader import RangeDownloader, DownloadStats, ResourceProbe
+from .enclosure_ranker import EnclosureRanker
+from .page_snapshot import PageSnapshot
+from .audio_cache import AudioCache, get_audio_cache
+from .storage_manager import StorageManager
+from .stream_decoder import StreamingDecoder, StreamTimings, DecodedAudio, SAMPLE_RATE
+from .config import Config
+
+
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".aac", ".ogg", ".opus", ".wav")
+GENERIC_BINARY_TYPES = ("application/octet-stream", "binary/octet-stream")
+# URL paths that are web pages, never probed as audio
+PAGE_EXTENSIONS = (".html", ".htm", ".php", ".asp", ".aspx", ".jsp", "/")
 
 
 class AudioDownloader:
     """Downloads podcast audio from URLs."""
     
-    def __init__(self, download_folder: str = "downloads"):
-        self.download_folder = download_folder
-        os.makedirs(download_folder, exist_ok=True)
+    def __init__(self, download_folder: str = "downloads", http_client: Optional[HttpClient] = None,
+                 http_cache: Optional[HttpCache] = None, audio_cache: Optional[AudioCache] = None,
+                 storage_manager: Optional[StorageManager] = None):
+        self.storage_manager = storage_manager
+        # Stage downloads on the storage manager's scratch folder when one is configured
+        self.download_folder = storage_manager.working_folder if storage_manager else download_folder
+        self.http_client = http_client or get_http_client()
+        self.http_cache = http_cache or get_http_cache()
+        self.range_downloader = RangeDownloader(self.http_client)
+        self.enclosure_ranker = EnclosureRanker(self.range_downloader)
+        self.stream_decoder = StreamingDecoder(self.http_client)
+        self.audio_cache = audio_cache or (get_audio_cache() if Config.AUDIO_CACHE_ENABLED else None)
+        self.last_download_stats: Optional[DownloadStats] = None
+        # Probes of URLs is_audio_url() recognised, reused by the download that follows
+        self._audio_probes: Dict[str, ResourceProbe] = {}
+        os.makedirs(self.download_folder, exist_ok=True)
     
     def download_audio(self, url: str, episode_title: str) -> Optional[str]:
         """
@@ -26,48 +53,207 @@ class AudioDownloader:
         Returns:
             Path to downloaded MP3 file, or None if failed
         """
+        mp3_url = self.find_audio_url(url, episode_title)
+        if not mp3_url:
+            return None
+        
+        return self.download_file(mp3_url, episode_title)
+    
+    def find_audio_url(self, url: str, episode_title: Optional[str] = None) -> Optional[str]:
+        """
+        Find the episode's audio URL on a podcast page.
+        
+        URLs that already point at audio are recognised from their
+        Content-Type and returned as-is, so the file is never fetched as HTML.
+        When a page links several audio files (trailers, other episodes),
+        they are ranked by EnclosureRanker and the best one is returned.
+        
+        Args:
+            url: Podcast page URL or direct audio URL
+            episode_title: Episode title used to tell the episode from other links
+            
+        Returns:
+            Direct MP3 URL, or None if none was found
+        """
         try:
-            response = requests.get(url)
-            if response.status_code != 200:
-                print(f"Failed to load page: {response.status_code}")
-                return None
+            if self.is_audio_url(url):
+                return url
             
-            # Find MP3 links using regex
-            html_content = response.text
-            mp3_links = re.findall(r'https?://[^\s"\']+\.mp3', html_content)
-            unique_links = list(set(mp3_links))
+            try:
+                page = PageSnapshot.fetch(url, self.http_cache)
+            except requests.HTTPError as e:
+                print(f"Failed to load page: {e.response.status_code}")
+                return None
             
-            if not unique_links:
-                print("No .mp3 links found.")
+            candidates = self.enclosure_ranker.rank(page, episode_title)
+            if not candidates:
+                print("No audio links found.")
                 return None
             
-            # Download the first unique MP3 link
-            mp3_url = unique_links[0]
-            print(f"Downloading: {mp3_url}")
+            if len(candidates) > 1:
+                print(f"Ranked {len(candidates)} audio links:")
+                for candidate in candidates[:5]:
+                    size = f"{candidate.total_bytes / (1024 * 1024):.1f} MB" if candidate.total_bytes else "size unknown"
+                    print(f"  {candidate.url} (structured={candidate.structured}, "
+                          f"title={candidate.title_score:.2f}, {size})")
             
-            # Create safe filename
-            safe_title = "".join(c for c in episode_title if c.isalnum() or c in (" ", "_", "-")).strip()
-            mp3_path = os.path.join(self.download_folder, f"{safe_title}.mp3")
+            return candidates[0].url
             
-            # Download the file
-            r = requests.get(mp3_url, stream=True)
-            r.raise_for_status()
+        except Exception as e:
+            print(f"Error finding audio link: {e}")
+            return None
+    
+    def download_file(self, mp3_url: str, episode_title: str) -> Optional[str]:
+        """
+        Download an audio file from its direct URL.
+        
+        Args:
+            mp3_url: Direct audio URL (e.g. a feed enclosure)
+            episode_title: Clean episode title for filename
+            
+        Returns:
+            Path to downloaded MP3 file, or None if failed
+        """
+        mp3_path = self._download_path(episode_title)
+        try:
+            
+            # Reuse a cached copy of this exact file version if we have one. It is keyed on
+            # the published URL: redirect targets of tracking and signed links change per request
+            probe = self._take_probe(mp3_url)
+            if self.audio_cache:
+                cached_path = self.audio_cache.lookup(mp3_url, probe.etag, probe.total_bytes)
+                if cached_path:
+                    print(f"Using cached audio: {cached_path}")
+                    return cached_path
+            
+            self._reserve(mp3_path, probe.total_bytes)
+            
+            # Download the file (parallel ranges, resuming any earlier partial download)
+            print(f"Downloading: {mp3_url}")
+            self.last_download_stats = self.range_downloader.download(mp3_url, mp3_path, probe)
             
-            with open(mp3_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if self.audio_cache:
+                try:
+                    cached_path = self.audio_cache.add(mp3_path, mp3_url, probe.etag, probe.total_bytes)
+                    self._unreserve(mp3_path)
+                    mp3_path = cached_path
+                except OSError as e:
+                    print(f"Error caching audio file: {e}")
             
             print(f"Saved as: {mp3_path}")
             return mp3_path
             
         except Exception as e:
+            # Partial files stay for a resumed download until the sweeper ages them out
+            self._unreserve(mp3_path)
             print(f"Error downloading audio: {e}")
             return None
     
+    def is_audio_url(self, url: str) -> bool:
+        """
+        Sniff whether a URL serves audio, using HEAD or a one-byte range request.
+        
+        Paths that end like a web page aren't probed. The probe of an audio
+        URL is kept for download_file() or stream_audio(), so the file isn't
+        probed again.
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            True if the server reports an audio Content-Type
+        """
+        path = urlparse(url).path.lower()
+        if not path or path.endswith(PAGE_EXTENSIONS):
+            return False
+        
+        try:
+            probe = self._audio_probes.get(url) or self.range_downloader.probe(url)
+        except Exception as e:
+            print(f"Error probing {url}: {e}")
+            return False
+        
+        content_type = probe.content_type.lower()
+        # Some hosts serve audio as a generic binary type
+        is_audio = content_type.startswith("audio/") or (
+            content_type.split(";")[0].strip() in GENERIC_BINARY_TYPES and path.endswith(AUDIO_EXTENSIONS)
+        )
+        if is_audio:
+            self._audio_probes[url] = probe
+        return is_audio
+    
+    def stream_audio(self, mp3_url: str, episode_title: str, save_to_disk: bool = True) -> Optional[DecodedAudio]:
+        """
+        Download audio while decoding it to 16 kHz PCM, so decode overlaps the transfer.
+        
+        A cached copy is decoded from disk instead of being downloaded again.
+        
+        Args:
+            mp3_url: Direct audio URL
+            episode_title: Clean episode title for filename
+            save_to_disk: Keep the downloaded MP3 (in the audio cache when enabled)
+            
+        Returns:
+            DecodedAudio with PCM samples, or None if failed
+        """
+        try:
+            timings = StreamTimings()
+            probe = self._take_probe(mp3_url)
+            if self.audio_cache:
+                cached_path = self.audio_cache.lookup(mp3_url, probe.etag, probe.total_bytes)
+                if cached_path:
+                    print(f"Decoding cached audio: {cached_path}")
+                    return self.stream_decoder.decode_file(cached_path, timings)
+            
+            print(f"Streaming: {mp3_url}")
+            save_path = self._download_path(episode_title) if save_to_disk else None
+            if save_path:
+                self._reserve(save_path, probe.total_bytes)
+            decoded = self.stream_decoder.decode_url(probe.url, save_path, timings)
+            
+            if save_path and self.audio_cache:
+                try:
+                    decoded.path = self.audio_cache.add(save_path, mp3_url, probe.etag, probe.total_bytes)
+                    self._unreserve(save_path)
+                except OSError as e:
+                    print(f"Error caching audio file: {e}")
+            
+            print(f"Decoded {len(decoded.audio) / SAMPLE_RATE / 60:.1f} min of audio ({timings.summary()})")
+            return decoded
+            
+        except Exception as e:
+            if save_to_disk:
+                self._unreserve(self._download_path(episode_title))
+            print(f"Error streaming audio: {e}")
+            return None
+    
+    def _take_probe(self, url: str) -> ResourceProbe:
+        """Probe a URL about to be downloaded, reusing the one is_audio_url() made."""
+        return self._audio_probes.pop(url, None) or self.range_downloader.probe(url)
+    
+    def _download_path(self, episode_title: str) -> str:
+        """Local MP3 path for an episode, built from a filesystem-safe title."""
+        safe_title = "".join(c for c in episode_title if c.isalnum() or c in (" ", "_", "-")).strip()
+        return os.path.join(self.download_folder, f"{safe_title}.mp3")
+    
+    def _reserve(self, file_path: str, size: Optional[int]) -> None:
+        """Make room for a download and protect it (and its partial files) from sweeping."""
+        if self.storage_manager:
+            self.storage_manager.make_room(size or 0)
+            self.storage_manager.register(file_path)
+    
+    def _unreserve(self, file_path: str) -> None:
+        if self.storage_manager:
+            self.storage_manager.unregister(file_path)
+    
     def cleanup_file(self, file_path: str) -> None:
-        """Remove downloaded audio file."""
+        """Remove downloaded audio file, or release it if it belongs to the audio cache."""
+        self._unreserve(file_path)
         try:
-            if os.path.exists(file_path):
+            if self.audio_cache and self.audio_cache.owns(file_path):
+                self.audio_cache.release(file_path)
+                print(f"Released cached audio: {file_path}")
+            elif os.path.exists(file_path):
                 os.remove(file_path)
                 print(f"Cleaned up: {file_path}")
         except Exception as e:
@@ -0,0 +1,179 @@
+"""Episode metadata for direct audio URLs, read from ID3 tags with Range requests."""
+
+import io
+import os
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from mutagen.id3 import ID3
+from mutagen.mp3 import MPEGInfo
+
+from .config import Config
+from .http_client import HttpClient, get_http_client
+
+
+# ID3v2 tags can carry large cover art; don't chase tags bigger than this
+MAX_ID3V2_BYTES = 4 * 1024 * 1024
+ID3V1_BYTES = 128
+
+
+class _PartialFile(io.BytesIO):
+    """The head of a remote file that reports the remote file's full size.
+
+    mutagen estimates CBR duration from the file size by seeking to the end;
+    this lets it do that without the rest of the file.
+    """
+
+    def __init__(self, data: bytes, total_size: Optional[int]):
+        super().__init__(data)
+        self.total_size = total_size or len(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 2:
+            return super().seek(self.total_size + offset, 0)
+        return super().seek(offset, whence)
+
+
+class AudioMetadataReader:
+    """Reads title, show name, description and duration from the first and last KB of an MP3."""
+
+    def __init__(self, http_client: Optional[HttpClient] = None, head_bytes: int = None):
+        """
+        Initialize the reader.
+
+        Args:
+            http_client: Client used for Range requests
+            head_bytes: Bytes read from the start of the file in the first request
+        """
+        self.http_client = http_client or get_http_client()
+        self.head_bytes = head_bytes or Config.AUDIO_METADATA_HEAD_BYTES
+
+    def read(self, url: str) -> Dict[str, str]:
+        """
+        Extract metadata from a direct audio URL.
+
+        Args:
+            url: Direct MP3 URL
+
+        Returns:
+            Dict with podcast_title, episode_title, episode_description and
+            duration_seconds; placeholders are used for anything not found
+        """
+        metadata = {
+            "podcast_title": "untitled_podcast",
+            "episode_title": self._title_from_url(url),
+            "episode_description": "no_description_found",
+            "duration_seconds": ""
+        }
+
+        try:
+            head, total_size = self._read_range(url, 0, self.head_bytes - 1)
+            tag_size = self._id3v2_size(head)
+            if tag_size and tag_size > len(head) and tag_size <= MAX_ID3V2_BYTES:
+                # Extend the head to cover the whole tag plus a few audio frames
+                rest, _ = self._read_range(url, len(head), tag_size + self.head_bytes // 4)
+                head += rest
+
+            tags = self._parse_id3v2(head) if tag_size else {}
+            if not tags.get("episode_title") and total_size:
+                tags = {**self._read_id3v1(url, total_size), **tags}
+
+            for key, value in tags.items():
+                if value and key != "length_ms":
+                    metadata[key] = value
+
+            duration = self._duration(head, tag_size or 0, total_size, tags.get("length_ms"))
+            if duration:
+                metadata["duration_seconds"] = f"{duration:.0f}"
+
+            print(f"Read audio metadata with {len(head) / 1024:.0f} KB of {total_size or '?'} bytes")
+
+        except Exception as e:
+            print(f"Error reading audio metadata: {e}")
+
+        return metadata
+
+    def _read_range(self, url: str, start: int, end: int) -> Tuple[bytes, Optional[int]]:
+        """Read bytes [start, end] and the full file size, without ever reading the whole body."""
+        with self.http_client.get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True) as response:
+            response.raise_for_status()
+            ranged = response.status_code == 206
+            # A server that ignores the range sends the file from byte 0
+            skip = 0 if ranged else start
+            wanted = end - start + 1
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=min(skip + wanted, 64 * 1024)):
+                data.extend(chunk)
+                if len(data) >= skip + wanted:
+                    break
+
+            if ranged:
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            else:
+                total = response.headers.get("Content-Length", "")
+            return bytes(data[skip:skip + wanted]), int(total) if total.isdigit() else None
+
+    def _id3v2_size(self, head: bytes) -> int:
+        """Total ID3v2 tag size (header included) from its syncsafe size field."""
+        if len(head) < 10 or head[:3] != b"ID3":
+            return 0
+        size = 0
+        for byte in head[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        has_footer = head[5] & 0x10
+        return 10 + size + (10 if has_footer else 0)
+
+    def _parse_id3v2(self, head: bytes) -> Dict[str, str]:
+        try:
+            tags = ID3(_PartialFile(head, None), load_v1=False)
+        except Exception as e:
+            print(f"Could not parse ID3v2 tag: {e}")
+            return {}
+
+        def text(frame_id: str) -> str:
+            frame = tags.get(frame_id)
+            return str(frame.text[0]).strip() if frame and frame.text else ""
+
+        descriptions = [str(frame.text[0]) for frame in tags.getall("COMM") if frame.text]
+        descriptions += [str(frame.text[0]) for frame in tags.getall("TDES") if frame.text]
+        length = text("TLEN")
+
+        return {
+            "episode_title": text("TIT2"),
+            "podcast_title": text("TALB") or text("TPE1"),
+            "episode_description": max(descriptions, key=len).strip() if descriptions else "",
+            "length_ms": length if length.isdigit() else ""
+        }
+
+    def _read_id3v1(self, url: str, total_size: int) -> Dict[str, str]:
+        """Read the 128-byte ID3v1 tag at the end of the file."""
+        tail, _ = self._read_range(url, total_size - ID3V1_BYTES, total_size - 1)
+        if len(tail) != ID3V1_BYTES or tail[:3] != b"TAG":
+            return {}
+
+        def field(start: int, end: int) -> str:
+            return tail[start:end].split(b"\x00")[0].decode("latin-1").strip()
+
+        return {
+            "episode_title": field(3, 33),
+            "podcast_title": field(63, 93) or field(33, 63),
+            "episode_description": field(97, 125)
+        }
+
+    def _duration(self, head: bytes, tag_size: int, total_size: Optional[int],
+                  length_ms: Optional[str]) -> Optional[float]:
+        """Duration from TLEN, a Xing/VBRI header, or bitrate and file size."""
+        if length_ms:
+            return int(length_ms) / 1000.0
+        try:
+            info = MPEGInfo(_PartialFile(head, total_size), offset=tag_size)
+        except Exception:
+            return None
+        return info.length if info.length and info.length > 0 else None
+
+    def _title_from_url(self, url: str) -> str:
+        """Readable fallback title from the URL's file name."""
+        name = os.path.splitext(os.path.basename(unquote(urlparse(url).path)))[0]
+        name = re.sub(r"[_\-]+", " ", name).strip()
+        return name or "untitled_episode"
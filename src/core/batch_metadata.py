@@ -0,0 +1,106 @@
+"""Concurrent metadata extraction for batches of episode URLs."""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from .config import Config
+from .http_cache import HttpCache, get_http_cache
+from .metadata_extractor import MetadataExtractor
+from .page_snapshot import PageSnapshot
+from .transcript_source import TranscriptMetadata
+
+
+DEFAULT_METADATA = {
+    "podcast_title": "untitled_podcast",
+    "episode_title": "untitled_episode",
+    "episode_description": "no_description_found"
+}
+
+
+def _parse_page(url: str, html_text: str) -> Dict[str, str]:
+    """Parse one page into metadata (runs inside a worker process)."""
+    return MetadataExtractor().extract_from_page(PageSnapshot(url, html_text))
+
+
+class AsyncMetadataExtractor:
+    """Fetches many episode pages concurrently and parses them in a worker pool."""
+
+    def __init__(self, max_concurrency: int = None, per_host_limit: int = None,
+                 parse_workers: int = None, http_cache: Optional[HttpCache] = None):
+        """
+        Initialize the batch extractor.
+
+        Args:
+            max_concurrency: Maximum page fetches in flight overall
+            per_host_limit: Maximum page fetches in flight per host
+            parse_workers: Worker processes for parsing; 0 parses on a thread
+            http_cache: HTTP cache used for page fetches
+        """
+        self.max_concurrency = max_concurrency or Config.METADATA_MAX_CONCURRENCY
+        self.per_host_limit = per_host_limit or Config.METADATA_PER_HOST_LIMIT
+        self.parse_workers = parse_workers if parse_workers is not None else Config.METADATA_PARSE_WORKERS
+        self.http_cache = http_cache or get_http_cache()
+
+    async def iter_metadata(self, urls: List[str]) -> AsyncIterator[TranscriptMetadata]:
+        """
+        Extract metadata for every URL, yielding results as they finish.
+
+        Pages that fail to load yield placeholder metadata, like
+        MetadataExtractor.extract_all_metadata does.
+
+        Args:
+            urls: Episode page URLs
+
+        Yields:
+            TranscriptMetadata in completion order
+        """
+        loop = asyncio.get_running_loop()
+        fetch_executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        parse_executor = self._create_parse_executor()
+        overall = asyncio.Semaphore(self.max_concurrency)
+        per_host: Dict[str, asyncio.Semaphore] = {}
+
+        async def process(url: str) -> TranscriptMetadata:
+            host = urlparse(url).netloc
+            host_limit = per_host.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            try:
+                async with host_limit, overall:
+                    response = await loop.run_in_executor(fetch_executor, self.http_cache.get, url)
+                metadata = await loop.run_in_executor(parse_executor, _parse_page, url, response.text)
+            except Exception as e:
+                print(f"Error extracting metadata for {url}: {e}")
+                metadata = DEFAULT_METADATA
+
+            return TranscriptMetadata(
+                title=metadata["episode_title"],
+                source_name=metadata["podcast_title"],
+                description=metadata["episode_description"],
+                url=url,
+                source_type="podcast"
+            )
+
+        tasks = [asyncio.ensure_future(process(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            fetch_executor.shutdown(wait=False)
+            parse_executor.shutdown(wait=False)
+
+    def extract_batch(self, urls: List[str]) -> List[TranscriptMetadata]:
+        """Synchronous helper returning metadata in the order of the input URLs."""
+
+        async def collect() -> Dict[str, TranscriptMetadata]:
+            return {metadata.url: metadata async for metadata in self.iter_metadata(urls)}
+
+        results = asyncio.run(collect())
+        return [results[url] for url in urls]
+
+    def _create_parse_executor(self) -> Executor:
+        if self.parse_workers <= 0:
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(max_workers=self.parse_workers)
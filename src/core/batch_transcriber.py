@@ -0,0 +1,141 @@
+"""Batched transcription of many episodes for bulk jobs."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import Config
+from .decode_profiles import DecodeProfile, get_decode_profile
+from .model_registry import ModelRegistry
+from .pcm_cache import PcmCache, get_pcm_cache
+from .stream_decoder import SAMPLE_RATE, StreamingDecoder
+from .transcription_engines import WhisperEngine, stitch_windows
+from .vad import SpeechWindow, split_windows
+
+# Whisper's encoder sees 30 s of audio at a time
+WINDOW_SECONDS = 30.0
+
+
+@dataclass
+class _Episode:
+    """Windows of one queued episode and the results routed back to it so far."""
+    windows: List[SpeechWindow]
+    audio_seconds: float
+    results: List[Tuple[SpeechWindow, Dict]] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) == len(self.windows)
+
+
+class BatchTranscriber:
+    """Transcribes a queue of episodes in mini-batches of 30-second windows.
+
+    Every episode is split at silences into windows of at most 30 s, and
+    windows from consecutive episodes are packed into batches of
+    ``batch_size`` for Whisper's encoder and decoder, so the per-call
+    overhead is paid once per batch instead of once per window. Each window's
+    result is routed back to its episode, which is stitched and returned as
+    soon as its last window is decoded.
+    """
+
+    def __init__(self, model_name: str = None, model_registry: Optional[ModelRegistry] = None,
+                 batch_size: int = None, pcm_cache: Optional[PcmCache] = None):
+        """
+        Initialize the transcriber.
+
+        Args:
+            model_name: Whisper model size (Config.WHISPER_MODEL by default)
+            model_registry: Registry the model is loaded from (the shared one by default)
+            batch_size: Windows decoded together (Config.TRANSCRIPTION_BATCH_SIZE by default)
+            pcm_cache: Cache of decoded audio (the shared one if Config.PCM_CACHE_ENABLED)
+        """
+        self.engine = WhisperEngine(model_name or Config.WHISPER_MODEL, model_registry)
+        self.batch_size = max(1, batch_size or Config.TRANSCRIPTION_BATCH_SIZE)
+        self.pcm_cache = pcm_cache or (get_pcm_cache() if Config.PCM_CACHE_ENABLED else None)
+
+    def transcribe(self, audio_inputs: Sequence[Union[str, np.ndarray]],
+                   decode_profile: Optional[str] = None) -> List[Optional[Dict]]:
+        """
+        Transcribe several episodes.
+
+        Args:
+            audio_inputs: Audio file paths or decoded 16 kHz mono PCM
+            decode_profile: Name of the decode profile (Config.DECODE_PROFILE by default)
+
+        Returns:
+            A Whisper-format result per input, in input order (None where decoding the audio failed)
+        """
+        results: List[Optional[Dict]] = [None] * len(audio_inputs)
+        for index, result in self.iter_transcribe(audio_inputs, decode_profile):
+            results[index] = result
+        return results
+
+    def iter_transcribe(self, audio_inputs: Sequence[Union[str, np.ndarray]],
+                        decode_profile: Optional[str] = None) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """
+        Transcribe several episodes, yielding each one as soon as it is done.
+
+        Yields:
+            (input index, result or None if its audio couldn't be decoded), roughly in input order
+        """
+        profile = get_decode_profile(decode_profile)
+        episodes: Dict[int, _Episode] = {}
+        batch: List[Tuple[int, SpeechWindow, np.ndarray]] = []
+        stats = {"windows": 0, "batches": 0, "audio_seconds": 0.0}
+        start = time.perf_counter()
+
+        for index, audio_input in enumerate(audio_inputs):
+            audio = self._decode(audio_input)
+            if audio is None:
+                yield index, None
+                continue
+
+            episode = _Episode(split_windows(audio, WINDOW_SECONDS), len(audio) / SAMPLE_RATE)
+            episodes[index] = episode
+            stats["audio_seconds"] += episode.audio_seconds
+            for window in episode.windows:
+                batch.append((index, window, audio[window.start:window.end]))
+                if len(batch) == self.batch_size:
+                    yield from self._flush(batch, episodes, profile, stats)
+                    batch = []
+            # An episode with no speech has nothing to wait for
+            yield from self._finished(episodes, profile)
+
+        if batch:
+            yield from self._flush(batch, episodes, profile, stats)
+
+        elapsed = time.perf_counter() - start
+        print(f"Batch transcription: {len(audio_inputs)} episodes, {stats['audio_seconds'] / 3600:.1f}h of audio "
+              f"in {elapsed:.0f}s (RTF {elapsed / max(stats['audio_seconds'], 1e-9):.3f}), "
+              f"{stats['windows']} windows in {stats['batches']} batches of up to {self.batch_size}")
+
+    def _flush(self, batch: List[Tuple[int, SpeechWindow, np.ndarray]], episodes: Dict[int, _Episode],
+               profile: DecodeProfile, stats: Dict) -> Iterator[Tuple[int, Dict]]:
+        """Decode a batch, route each window's result to its episode and yield finished episodes."""
+        results = self.engine.decode_windows([samples for _, _, samples in batch], profile)
+        for (index, window, _), result in zip(batch, results):
+            episodes[index].results.append((window, result))
+        stats["windows"] += len(batch)
+        stats["batches"] += 1
+        yield from self._finished(episodes, profile)
+
+    def _finished(self, episodes: Dict[int, _Episode], profile: DecodeProfile) -> Iterator[Tuple[int, Dict]]:
+        for index in [index for index, episode in episodes.items() if episode.done]:
+            result = stitch_windows(episodes.pop(index).results)
+            result["decode_profile"] = profile.label
+            yield index, result
+
+    def _decode(self, audio_input: Union[str, np.ndarray]) -> Optional[np.ndarray]:
+        """PCM for a queued input; a file that can't be decoded fails only its own episode."""
+        if isinstance(audio_input, np.ndarray):
+            return audio_input
+        try:
+            if self.pcm_cache:
+                return self.pcm_cache.get(audio_input)
+            return StreamingDecoder().decode_file(audio_input).audio
+        except Exception as e:
+            print(f"Error decoding {audio_input}: {e}")
+            return None
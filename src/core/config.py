@@ -15,11 +15,115 @@ class Config:
     # Whisper settings
     WHISPER_MODEL: str = "base"  # Options: tiny, base, small, medium, large
     
+    # Transcription engine: "whisper" (reference PyTorch) or "faster-whisper" (CTranslate2)
+    TRANSCRIPTION_ENGINE: str = "whisper"
+    TRANSCRIPTION_COMPUTE_TYPE: str = "int8"  # faster-whisper quantization
+    TRANSCRIPTION_CPU_THREADS: int = 0  # Intra-op threads per transcription (0 for the library default)
+    TRANSCRIPTION_NUM_WORKERS: int = 1  # Inter-op workers / concurrent transcriptions
+    
+    # Parallel transcription: split episodes at silences (energy VAD) and
+    # transcribe the windows on a pool of worker processes
+    PARALLEL_TRANSCRIPTION: bool = False
+    TRANSCRIPTION_WORKERS: int = max(1, (os.cpu_count() or 1) // 2)  # Each worker loads its own model
+    VAD_FRAME_MS: int = 30
+    VAD_MARGIN_DB: float = 12.0  # Level above the noise floor that counts as speech
+    VAD_MAX_THRESHOLD_DB: float = -35.0
+    VAD_MIN_SILENCE_MS: int = 500  # Shorter pauses don't split speech
+    VAD_PAD_MS: int = 200
+    VAD_MERGE_GAP_SECONDS: float = 3.0  # Longer silences are skipped
+    VAD_MAX_WINDOW_SECONDS: float = 300.0
+    
+    # Streaming transcription: segments are cleaned while later ones are still being transcribed
+    STREAMING_TRANSCRIPTION: bool = False
+    STREAMING_WINDOW_SECONDS: float = 120.0  # Window size for engines that can't stream segments
+    
+    # Tempo compression: speed audio up (pitch unchanged) before transcription; 1.25-1.5 suits conversation
+    AUDIO_TEMPO: float = 1.0
+    
+    # Bulk jobs: 30 s windows from several episodes decoded together (whisper engine)
+    TRANSCRIPTION_BATCH_SIZE: int = 8
+    
+    # Decoding: "default" (Whisper's own settings), "fast", "balanced" or "accurate" (see decode_profiles.py); jobs can pick their own
+    DECODE_PROFILE: str = "default"
+    DECODE_LANGUAGE: Optional[str] = None  # e.g. "en" to skip language detection
+    
+    # Checkpointing: save finished windows so a restarted job resumes instead of starting over
+    TRANSCRIPTION_CHECKPOINTS: bool = False
+    CHECKPOINT_FOLDER: str = "checkpoints"
+    CHECKPOINT_INTERVAL: float = 60  # Minimum seconds between checkpoint writes
+    CHECKPOINT_MAX_AGE: float = 7 * 24 * 3600  # Older checkpoints are discarded
+    
+    # Two-pass refinement: re-transcribe low-confidence segments with a larger model
+    REFINE_MODEL: Optional[str] = None  # e.g. "medium"; None disables the second pass
+    REFINE_LOGPROB_THRESHOLD: float = -1.0  # Segments with a lower avg_logprob are re-decoded
+    REFINE_COMPRESSION_THRESHOLD: float = 2.4  # ...or a higher compression ratio (repetition)
+    REFINE_NO_SPEECH_THRESHOLD: float = 0.6  # ...or text where no speech was likely
+    REFINE_MERGE_GAP_SECONDS: float = 2.0  # Flagged segments this close are re-decoded together
+    
+    # Model residency: models are loaded once per process and shared
+    MODEL_PREWARM: bool = True  # Load WHISPER_MODEL in the background when the app starts
+    MODEL_IDLE_UNLOAD: float = 30 * 60  # Seconds unused before a model is unloaded (0 keeps it)
+    MODEL_MAX_RESIDENT_BYTES: int = 0  # Memory cap across loaded models (0 for no cap)
+    
     # File paths
     DOWNLOAD_FOLDER: str = "downloads"
     TRANSCRIPT_FOLDER: str = "transcripts"
     STATIC_FOLDER: str = "static"
     
+    # HTTP client settings
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_POOL_CONNECTIONS: int = 10  # Number of hosts with pooled connections
+    HTTP_POOL_MAXSIZE: int = 8  # Max concurrent connections per host
+    HTTP_POOL_TIMEOUT: float = 60.0  # Seconds to wait for a free connection before failing
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_BASE: float = 0.5  # Seconds, doubled on each retry
+    HTTP_BACKOFF_MAX: float = 20.0
+    
+    # Audio download settings
+    DOWNLOAD_CONNECTIONS: int = 4  # Parallel Range connections per file
+    DOWNLOAD_SEGMENT_SIZE: int = 8 * 1024 * 1024
+    DOWNLOAD_BUFFER_SIZE: int = 1024 * 1024
+    ENCLOSURE_PROBE_WORKERS: int = 8  # Concurrent HEAD requests when ranking audio links on a page
+    ENCLOSURE_MAX_CANDIDATES: int = 12
+    
+    # Download storage: byte budget, orphan sweeping and optional fast scratch folder
+    DOWNLOAD_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    DOWNLOAD_ORPHAN_AGE: float = 6 * 3600  # Seconds before an unused download is swept
+    DOWNLOAD_SWEEP_INTERVAL: float = 15 * 60
+    SCRATCH_FOLDER: Optional[str] = None  # e.g. "/dev/shm/readcast" to stage downloads on tmpfs
+    
+    # Direct audio URLs: bytes read from the start of the file for ID3 metadata
+    AUDIO_METADATA_HEAD_BYTES: int = 64 * 1024
+    
+    # Streaming decode: pipe the download into ffmpeg instead of writing the MP3 first
+    STREAMING_DECODE: bool = False
+    STREAMING_SAVE_AUDIO: bool = True  # Also keep the MP3 on disk (in the audio cache)
+    
+    # Audio cache (skips re-downloading episodes that are processed again)
+    AUDIO_CACHE_ENABLED: bool = True
+    AUDIO_CACHE_FOLDER: str = "audio_cache"
+    AUDIO_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024
+    
+    # Decoded PCM cache: 16 kHz float32 .npy files, memory-mapped by the transcriber and its workers
+    PCM_CACHE_ENABLED: bool = True
+    PCM_CACHE_FOLDER: str = "pcm_cache"
+    PCM_CACHE_MAX_BYTES: int = 4 * 1024 * 1024 * 1024  # About 17 hours of audio
+    
+    # HTTP cache settings (episode pages and feeds)
+    HTTP_CACHE_FOLDER: str = "http_cache"
+    HTTP_CACHE_TTL: float = 3600  # Seconds an entry is served without revalidation
+    HTTP_CACHE_MAX_AGE: float = 7 * 24 * 3600  # Seconds before an unrevalidated entry is evicted
+    HTTP_CACHE_MAX_BYTES: int = 200 * 1024 * 1024  # Compressed size budget
+    
+    # Batch metadata extraction
+    METADATA_MAX_CONCURRENCY: int = 32  # Page fetches in flight overall
+    METADATA_PER_HOST_LIMIT: int = 8  # Page fetches in flight per host
+    METADATA_PARSE_WORKERS: int = min(4, os.cpu_count() or 1)  # 0 parses on a thread
+    
+    # Podcast RSS feed cache
+    FEED_CACHE_FOLDER: str = "feed_cache"
+    
     # Chunking settings
     CHUNK_OVERLAP: int = 100
     
@@ -29,6 +133,8 @@ class Config:
     # Transcript filename suffixes
     RAW_TRANSCRIPT_SUFFIX: str = " (raw version)"
     CLEANED_TRANSCRIPT_SUFFIX: str = ""
+    SEGMENTS_SUFFIX: str = " (segments)"
+    SAVE_SEGMENTS: bool = True  # Keep timed segments (.npz) next to the transcripts
     ALLOWED_FILENAME_CHARS: str = " _-&()"
     
     @classmethod
@@ -0,0 +1,76 @@
+"""Named decode profiles trading transcription speed against quality."""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+from .config import Config
+
+
+@dataclass(frozen=True)
+class DecodeProfile:
+    """Decoding options for one speed/quality trade-off.
+
+    Engines turn a profile into their backend's keyword arguments with
+    TranscriptionEngine.decode_options().
+    """
+    name: str
+    beam_size: Optional[int]  # None decodes greedily
+    best_of: Optional[int]  # Candidates sampled at non-zero temperatures
+    temperatures: Tuple[float, ...]  # Fallback schedule when a decode fails the quality checks
+    fp16: bool  # Half precision (GPU only; Whisper falls back to fp32 on CPU)
+    condition_on_previous_text: bool  # Prompt each window with the last; accurate but can loop
+    language: Optional[str] = None  # Pinned language, skipping detection
+
+    def with_language(self, language: Optional[str]) -> "DecodeProfile":
+        """Copy of the profile with the language pinned (None keeps detection)."""
+        return replace(self, language=language)
+
+    @property
+    def label(self) -> str:
+        """Name plus pinned language, as recorded with a transcript."""
+        return f"{self.name} ({self.language})" if self.language else self.name
+
+
+DECODE_PROFILES: Dict[str, DecodeProfile] = {
+    # One greedy pass, no fallback and no conditioning: the fastest, and immune to repetition loops
+    "fast": DecodeProfile(
+        "fast", beam_size=None, best_of=None, temperatures=(0.0,),
+        fp16=True, condition_on_previous_text=False
+    ),
+    # Whisper's own transcribe() defaults: greedy with the full fallback schedule, one sample per
+    # temperature. The default, so jobs decode exactly as they did before profiles existed
+    "default": DecodeProfile(
+        "default", beam_size=None, best_of=None, temperatures=(0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        fp16=True, condition_on_previous_text=True
+    ),
+    # Greedy with a short fallback schedule
+    "balanced": DecodeProfile(
+        "balanced", beam_size=None, best_of=3, temperatures=(0.0, 0.4, 0.8),
+        fp16=True, condition_on_previous_text=True
+    ),
+    # The whisper command line's settings: beam search, best of 5 and the full fallback schedule
+    "accurate": DecodeProfile(
+        "accurate", beam_size=5, best_of=5, temperatures=(0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        fp16=True, condition_on_previous_text=True
+    )
+}
+
+
+def get_decode_profile(name: str = None, language: str = None) -> DecodeProfile:
+    """
+    Look up a decode profile by name.
+
+    Args:
+        name: One of DECODE_PROFILES (Config.DECODE_PROFILE by default)
+        language: Language to pin, e.g. "en" (Config.DECODE_LANGUAGE by default)
+
+    Returns:
+        The profile
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    name = name or Config.DECODE_PROFILE
+    if name not in DECODE_PROFILES:
+        raise ValueError(f"Unknown decode profile: {name} (choose from {', '.join(DECODE_PROFILES)})")
+    return DECODE_PROFILES[name].with_language(language or Config.DECODE_LANGUAGE)
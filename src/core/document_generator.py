@@ -19,7 +19,8 @@ class DocumentGenerator:
         os.makedirs(transcript_folder, exist_ok=True)
     
     def create_document(self, episode_title: str, podcast_title: str, speakers: Dict[str, List[str]],
-                        transcript_text: str, cleaned: bool = True, save_to_disk: bool = False) -> Dict[str, bytes]:
+                        transcript_text: str, cleaned: bool = True, save_to_disk: bool = False,
+                        decode_profile: Optional[str] = None) -> Dict[str, bytes]:
 
     # def create_document(self, episode_title: str, podcast_title: str, speakers: Dict[str, List[str]], 
     #                    transcript_text: str, cleaned: bool = True) -> str:
@@ -32,6 +33,7 @@ class DocumentGenerator:
             speakers: Dictionary with speaker information
             transcript_text: The transcript content
             cleaned: Whether this is a cleaned transcript
+            decode_profile: Decode profile the audio was transcribed with, if any
             
         Returns:
             Path to created document
@@ -68,6 +70,9 @@ class DocumentGenerator:
             guests_str = ", ".join(speakers["guests"])
             doc.add_paragraph(f"Guest(s): {guests_str}")
         
+        if decode_profile:
+            doc.add_paragraph(f"Decode profile: {decode_profile}")
+        
         # Add separator
         doc.add_paragraph("\n" + "="*50 + "\n")
         
@@ -112,6 +117,11 @@ class DocumentGenerator:
                 # Normal text
                 paragraph.add_run(part)
     
+    def get_segments_path(self, episode_title: str) -> str:
+        """Get the path of an episode's timed segment store (.npz), next to its documents."""
+        safe_title = "".join(c for c in episode_title if c.isalnum() or c in Config.ALLOWED_FILENAME_CHARS).strip()
+        return os.path.join(self.transcript_folder, f"{safe_title}{Config.SEGMENTS_SUFFIX}.npz")
+    
     def get_document_path(self, episode_title: str, cleaned: bool = True) -> str:
         """Get the expected document path for an episode."""
         suffix = Config.CLEANED_TRANSCRIPT_SUFFIX if cleaned else Config.RAW_TRANSCRIPT_SUFFIX
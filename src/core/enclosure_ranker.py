@@ -0,0 +1,203 @@
+"""Deterministic ranking of candidate audio links found on an episode page."""
+
+import difflib
+import html
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Set
+from urllib.parse import unquote, urlparse
+
+from .config import Config
+from .page_snapshot import PageSnapshot
+from .range_downloader import RangeDownloader, ResourceProbe
+
+
+AUDIO_LINK_PATTERN = re.compile(
+    r'https?://[^\s"\'<>\\]+?\.(?:mp3|m4a|aac|ogg|opus|wav)(?:\?[^\s"\'<>\\]*)?',
+    re.IGNORECASE
+)
+
+# Meta tags that name the episode's audio
+AUDIO_META_KEYS = ("og:audio", "og:audio:url", "og:audio:secure_url", "twitter:player:stream")
+
+# Title similarity is compared in steps of this size, so near-equal scores fall
+# through to the size/duration probe instead of being decided by noise
+TITLE_SCORE_STEP = 0.05
+
+# Typical podcast bitrate (128 kbps) used to estimate duration from Content-Length
+BYTES_PER_SECOND = 16000
+
+
+@dataclass
+class EnclosureCandidate:
+    """An audio link found on a page, with the evidence used to rank it."""
+    url: str
+    structured: bool  # Named by JSON-LD or an og:audio meta tag
+    title_score: float  # Similarity of the file name to the episode title, 0-1
+    total_bytes: Optional[int] = None
+    duration_seconds: Optional[float] = None  # Estimated from Content-Length
+    reachable: bool = True
+
+    def sort_key(self, expected_duration: Optional[float]):
+        """Key ordering candidates best first; the URL breaks any remaining tie."""
+        bucket = round(self.title_score / TITLE_SCORE_STEP)
+        if expected_duration and self.duration_seconds:
+            size_rank = abs(self.duration_seconds - expected_duration)
+        else:
+            # Trailers and clips are small; the full episode is usually the largest file
+            size_rank = -(self.total_bytes or 0)
+        # An unknown size says nothing about the file, so it ranks after every probed one
+        return (not self.reachable, not self.structured, -bucket,
+                self.duration_seconds is None, size_rank, self.url)
+
+
+class EnclosureRanker:
+    """Picks the episode's audio among every audio link on a page.
+
+    Candidates are ordered by, in turn: being named by the page's structured
+    data, closeness of the file name to the episode title, and closeness of
+    the size (or estimated duration) probed with concurrent HEAD requests.
+    """
+
+    def __init__(self, range_downloader: Optional[RangeDownloader] = None,
+                 probe_workers: int = None, max_candidates: int = None):
+        """
+        Initialize the ranker.
+
+        Args:
+            range_downloader: Downloader whose probe() is used for HEAD requests
+            probe_workers: Concurrent probes
+            max_candidates: Candidates probed per page, best pre-ranked first
+        """
+        self.range_downloader = range_downloader or RangeDownloader()
+        self.probe_workers = probe_workers or Config.ENCLOSURE_PROBE_WORKERS
+        self.max_candidates = max_candidates or Config.ENCLOSURE_MAX_CANDIDATES
+
+    def rank(self, page: PageSnapshot, episode_title: Optional[str] = None) -> List[EnclosureCandidate]:
+        """
+        Rank the audio links of a page, best first.
+
+        Args:
+            page: Snapshot of the episode page
+            episode_title: Episode title, if already known
+
+        Returns:
+            Ranked candidates; empty if the page links no audio
+        """
+        structured = self.structured_urls(page)
+        urls = self.candidate_urls(page, structured)
+        if not urls:
+            return []
+
+        structured_keys = {_url_key(url) for url in structured}
+        episode_title = episode_title or page.episode_title_text or page.title_text or ""
+        candidates = [
+            EnclosureCandidate(
+                url=url,
+                structured=_url_key(url) in structured_keys,
+                title_score=_title_score(url, episode_title)
+            )
+            for url in urls
+        ]
+
+        expected_duration = self.expected_duration(page)
+        candidates.sort(key=lambda candidate: candidate.sort_key(expected_duration))
+        if len(candidates) > 1:
+            self._probe(candidates[:self.max_candidates])
+            candidates.sort(key=lambda candidate: candidate.sort_key(expected_duration))
+
+        return candidates
+
+    def candidate_urls(self, page: PageSnapshot, structured: Set[str]) -> List[str]:
+        """Every distinct audio URL on the page, in sorted order."""
+        text = html.unescape(page.html.replace("\\/", "/"))
+        urls = {match.group(0) for match in AUDIO_LINK_PATTERN.finditer(text)}
+        urls.update(structured)
+        return sorted(urls)
+
+    def structured_urls(self, page: PageSnapshot) -> Set[str]:
+        """Audio URLs the page names explicitly in JSON-LD or meta tags."""
+        urls = set()
+        for item in page.json_ld_items():
+            for key in ("associatedMedia", "audio", "contentUrl"):
+                urls.update(_media_urls(item.get(key)))
+        for key in AUDIO_META_KEYS:
+            value = page.meta_content(key)
+            if value and value.startswith("http"):
+                urls.add(html.unescape(value))
+        return urls
+
+    def expected_duration(self, page: PageSnapshot) -> Optional[float]:
+        """Episode duration in seconds from the page's JSON-LD, if given."""
+        for item in page.json_ld_items():
+            for key in ("duration", "timeRequired"):
+                seconds = _iso_duration(item.get(key))
+                if seconds:
+                    return seconds
+        return None
+
+    def _probe(self, candidates: List[EnclosureCandidate]) -> None:
+        """Fill in size and estimated duration with concurrent HEAD requests."""
+        def probe(candidate: EnclosureCandidate) -> Optional[ResourceProbe]:
+            try:
+                return self.range_downloader.probe(candidate.url)
+            except Exception as e:
+                print(f"Error probing {candidate.url}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.probe_workers, len(candidates))) as executor:
+            probes = list(executor.map(probe, candidates))
+
+        for candidate, result in zip(candidates, probes):
+            if result is None:
+                candidate.reachable = False
+                continue
+            content_type = result.content_type.lower()
+            if content_type.startswith(("text/", "application/json")):
+                candidate.reachable = False
+            candidate.total_bytes = result.total_bytes
+            if result.total_bytes:
+                candidate.duration_seconds = result.total_bytes / BYTES_PER_SECOND
+
+
+def _media_urls(value) -> List[str]:
+    """URLs in a JSON-LD media field (a URL, a MediaObject or a list of either)."""
+    if isinstance(value, str):
+        return [value] if value.startswith("http") else []
+    if isinstance(value, dict):
+        return _media_urls(value.get("contentUrl") or value.get("url"))
+    if isinstance(value, list):
+        return [url for entry in value for url in _media_urls(entry)]
+    return []
+
+
+def _url_key(url: str) -> str:
+    """URL without query or fragment, for matching tracking variants of one file."""
+    parsed = urlparse(url)
+    return f"{parsed.netloc.lower()}{parsed.path}"
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[^\w\s]|_", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _title_score(url: str, episode_title: str) -> float:
+    """Similarity of a URL's file name to the episode title."""
+    if not episode_title:
+        return 0.0
+    name = os.path.splitext(os.path.basename(unquote(urlparse(url).path)))[0]
+    return difflib.SequenceMatcher(None, _normalize(name), _normalize(episode_title)).ratio()
+
+
+def _iso_duration(value) -> Optional[float]:
+    """Seconds in an ISO 8601 duration such as PT1H2M30S."""
+    if not isinstance(value, str):
+        return None
+    match = re.fullmatch(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?", value.strip())
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (float(group or 0) for group in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
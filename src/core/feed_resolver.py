@@ -0,0 +1,313 @@
+"""Resolve podcast episode URLs to their RSS feed entries."""
+
+import difflib
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from .config import Config
+from .http_cache import HttpCache, get_http_cache
+
+
+ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup?id={id}&entity={entity}&limit={limit}"
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search?term={term}&media=podcast&entity=podcast&limit=10"
+
+ITUNES_NS = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+
+# Minimum similarity for a fuzzy episode title match
+TITLE_MATCH_THRESHOLD = 0.9
+
+
+@dataclass
+class FeedEpisode:
+    """One <item> of a podcast RSS feed."""
+    title: str
+    description: str
+    enclosure_url: str
+    enclosure_length: Optional[int]
+    enclosure_type: str
+    guid: str
+    pub_date: str
+    duration: str
+    podcast_title: str = ""
+
+
+class FeedCache:
+    """Parsed feeds stored locally and refreshed incrementally."""
+
+    def __init__(self, cache_folder: str = None, http_cache: Optional[HttpCache] = None):
+        self.cache_folder = cache_folder or Config.FEED_CACHE_FOLDER
+        self.http_cache = http_cache or get_http_cache()
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def get_episodes(self, feed_url: str) -> List[FeedEpisode]:
+        """
+        Get the episodes of a feed.
+
+        The feed document is fetched through the HTTP cache, so an unchanged
+        feed costs a 304. When it did change, only <item>s whose GUID isn't
+        stored yet are converted; stored episodes are reused, wherever the
+        new ones appear in the feed.
+
+        Args:
+            feed_url: RSS feed URL
+
+        Returns:
+            List of episodes in feed order
+        """
+        response = self.http_cache.get(feed_url)
+        content_hash = hashlib.sha1(response.content).hexdigest()
+
+        stored = self._load(feed_url)
+        if stored and stored.get("content_hash") == content_hash:
+            return [FeedEpisode(**item) for item in stored["items"]]
+
+        stored_items = {item["guid"]: item for item in stored["items"]} if stored else {}
+        podcast_title, feed_guids, new_items = self._parse_new_items(response.content, stored_items.keys())
+        podcast_title = podcast_title or (stored or {}).get("title", "")
+
+        # Feed order, whichever way the feed sorts; stored episodes it no longer lists go last
+        items = [new_items.get(guid) or stored_items[guid] for guid in feed_guids]
+        listed = set(feed_guids)
+        items += [item for guid, item in stored_items.items() if guid not in listed]
+        for item in items:
+            item["podcast_title"] = podcast_title
+
+        self._save(feed_url, {
+            "feed_url": feed_url,
+            "title": podcast_title,
+            "content_hash": content_hash,
+            "updated_at": time.time(),
+            "items": items
+        })
+        print(f"Feed refreshed: {len(new_items)} new episode(s), {len(items)} total")
+        return [FeedEpisode(**item) for item in items]
+
+    def _parse_new_items(self, content: bytes, known_guids):
+        """
+        Stream-parse a feed, converting only the <item>s not already stored.
+
+        Returns:
+            (podcast title, every item GUID in feed order, new items by GUID)
+        """
+        podcast_title = ""
+        feed_guids: List[str] = []
+        new_items: Dict[str, Dict] = {}
+        depth_in_item = 0
+
+        for event, elem in ET.iterparse(io.BytesIO(content), events=("start", "end")):
+            if elem.tag == "item":
+                if event == "start":
+                    depth_in_item += 1
+                    continue
+                depth_in_item -= 1
+                guid = _item_guid(elem)
+                if guid in known_guids:
+                    feed_guids.append(guid)
+                else:
+                    item = self._item_to_dict(elem)
+                    if item is not None:
+                        new_items[guid] = item
+                        feed_guids.append(guid)
+                elem.clear()
+            elif event == "end" and elem.tag == "title" and not depth_in_item and not podcast_title:
+                podcast_title = (elem.text or "").strip()
+
+        # A GUID listed twice keeps its first position
+        return podcast_title, list(dict.fromkeys(feed_guids)), new_items
+
+    def _item_to_dict(self, item: ET.Element) -> Optional[Dict]:
+        enclosure = item.find("enclosure")
+        if enclosure is None or not enclosure.get("url"):
+            return None
+
+        length = enclosure.get("length")
+        description = (
+            item.findtext(f"{CONTENT_NS}encoded")
+            or item.findtext("description")
+            or item.findtext(f"{ITUNES_NS}summary")
+            or ""
+        )
+        return asdict(FeedEpisode(
+            title=(item.findtext("title") or "").strip(),
+            description=_html_to_text(description),
+            enclosure_url=enclosure.get("url").strip(),
+            enclosure_length=int(length) if length and length.isdigit() and int(length) > 0 else None,
+            enclosure_type=enclosure.get("type", ""),
+            guid=_item_guid(item),
+            pub_date=(item.findtext("pubDate") or "").strip(),
+            duration=(item.findtext(f"{ITUNES_NS}duration") or "").strip()
+        ))
+
+    def _path(self, feed_url: str) -> str:
+        key = hashlib.sha256(feed_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_folder, f"{key}.json")
+
+    def _load(self, feed_url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(feed_url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, feed_url: str, data: Dict) -> None:
+        path = self._path(feed_url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving feed cache for {feed_url}: {e}")
+
+
+class FeedResolver:
+    """Maps Apple Podcasts and Spotify episode URLs to their RSS feed episode."""
+
+    def __init__(self, feed_cache: Optional[FeedCache] = None, http_cache: Optional[HttpCache] = None):
+        self.http_cache = http_cache or get_http_cache()
+        self.feed_cache = feed_cache or FeedCache(http_cache=self.http_cache)
+
+    def resolve(self, url: str, podcast_title: Optional[str] = None,
+                episode_title: Optional[str] = None) -> Optional[FeedEpisode]:
+        """
+        Find the feed episode for an episode page URL.
+
+        Apple Podcasts URLs are resolved by podcast ID and matched on the
+        episode GUID from the iTunes lookup API; other URLs need a podcast
+        title to search for and an episode title to match against.
+
+        Args:
+            url: Episode page URL
+            podcast_title: Show name, used when the URL has no Apple podcast ID
+            episode_title: Episode title, used when no GUID is available
+
+        Returns:
+            Matching FeedEpisode, or None if it could not be resolved
+        """
+        try:
+            apple_ids = self._apple_ids(url)
+            if apple_ids:
+                podcast_id, episode_id = apple_ids
+                feed_url = self._lookup_feed_url(podcast_id)
+                guid = self._lookup_episode_guid(podcast_id, episode_id) if episode_id else None
+            elif podcast_title:
+                feed_url = self._search_feed_url(podcast_title)
+                guid = None
+            else:
+                return None
+
+            if not feed_url:
+                return None
+
+            episodes = self.feed_cache.get_episodes(feed_url)
+            episode = self._match(episodes, guid, episode_title)
+            if episode:
+                print(f"Resolved feed episode: {episode.title}")
+            return episode
+
+        except Exception as e:
+            print(f"Error resolving feed episode: {e}")
+            return None
+
+    def _apple_ids(self, url: str):
+        """Extract (podcast ID, episode ID or None) from an Apple Podcasts URL."""
+        if "podcasts.apple.com" not in url:
+            return None
+        podcast_match = re.search(r"/id(\d+)", url)
+        if not podcast_match:
+            return None
+        episode_match = re.search(r"[?&]i=(\d+)", url)
+        return podcast_match.group(1), episode_match.group(1) if episode_match else None
+
+    def _lookup_feed_url(self, podcast_id: str) -> Optional[str]:
+        results = self._itunes_results(ITUNES_LOOKUP_URL.format(id=podcast_id, entity="podcast", limit=1))
+        for result in results:
+            if result.get("feedUrl"):
+                return result["feedUrl"]
+        return None
+
+    def _lookup_episode_guid(self, podcast_id: str, episode_id: str) -> Optional[str]:
+        results = self._itunes_results(ITUNES_LOOKUP_URL.format(id=podcast_id, entity="podcastEpisode", limit=200))
+        for result in results:
+            if str(result.get("trackId")) == episode_id:
+                return result.get("episodeGuid")
+        return None
+
+    def _search_feed_url(self, podcast_title: str) -> Optional[str]:
+        results = self._itunes_results(ITUNES_SEARCH_URL.format(term=quote_plus(podcast_title)))
+        wanted = _normalize_title(podcast_title)
+        for result in results:
+            if _normalize_title(result.get("collectionName", "")) == wanted and result.get("feedUrl"):
+                return result["feedUrl"]
+        return None
+
+    def _itunes_results(self, api_url: str) -> List[Dict]:
+        response = self.http_cache.get(api_url)
+        return json.loads(response.text).get("results", [])
+
+    def _match(self, episodes: List[FeedEpisode], guid: Optional[str],
+               episode_title: Optional[str]) -> Optional[FeedEpisode]:
+        """Match by GUID, then exact normalized title, then closest title with the same numbers."""
+        if guid:
+            for episode in episodes:
+                if episode.guid == guid:
+                    return episode
+
+        if not episode_title:
+            return None
+
+        wanted = _normalize_title(episode_title)
+        wanted_numbers = _title_numbers(wanted)
+        best, best_score = None, 0.0
+        for episode in episodes:
+            candidate = _normalize_title(episode.title)
+            if candidate == wanted:
+                return episode
+            # "Episode 101 - X" and "Episode 102 - X" are near-identical strings but different episodes
+            if _title_numbers(candidate) != wanted_numbers:
+                continue
+            score = difflib.SequenceMatcher(None, wanted, candidate).ratio()
+            if score > best_score:
+                best, best_score = episode, score
+
+        return best if best_score >= TITLE_MATCH_THRESHOLD else None
+
+
+def _item_guid(item: ET.Element) -> Optional[str]:
+    """An <item>'s GUID, falling back to its enclosure URL."""
+    enclosure = item.find("enclosure")
+    guid = item.findtext("guid") or (enclosure.get("url") if enclosure is not None else None)
+    return guid.strip() if guid else None
+
+
+def _title_numbers(title: str) -> List[str]:
+    """Numbers in a normalized title, e.g. episode and part numbers."""
+    return re.findall(r"\d+", title)
+
+
+def _normalize_title(title: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace for title comparison."""
+    title = html.unescape(title).lower().replace("’", "'")
+    title = re.sub(r"[^\w\s]", " ", title)
+    return re.sub(r"\s+", " ", title).strip()
+
+
+def _html_to_text(text: str) -> str:
+    """Convert feed description HTML to plain text with paragraph breaks."""
+    text = re.sub(r"(?i)<br\s*/?>", "\n", text)
+    text = re.sub(r"(?i)</p\s*>", "\n\n", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = html.unescape(text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n+", "\n\n", text)
+    return text.strip()
@@ -0,0 +1,131 @@
+"""Fast regex scanner for the few tags metadata extraction needs."""
+
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# One pass over the document visits only the tags we care about
+_TAG_PATTERN = re.compile(
+    r'<script\b(?P<script_attrs>[^>]*)>(?P<script_body>.*?)</script\s*>'
+    r'|<meta\b(?P<meta_attrs>[^>]*)>'
+    r'|<title\b[^>]*>(?P<title>.*?)</title\s*>'
+    r'|<span\b(?P<span_attrs>[^>]*(?:episode-lockup-title|episode-details__title-text)[^>]*)>'
+    r'(?P<span_body>.*?)</span\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_INNER_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Episode descriptions shorter than this fall back to the paragraphs block
+LONG_DESCRIPTION_CHARS = 400
+
+
+@dataclass
+class ScanResult:
+    """Tags found by a scan, plus whether the scan stopped early."""
+    json_ld: List[Dict] = field(default_factory=list)
+    meta: Dict[str, str] = field(default_factory=dict)
+    title: Optional[str] = None
+    episode_title: Optional[str] = None
+    episode_title_deferred: bool = False  # The first title span needs the DOM to read
+    stopped_early: bool = False
+    scanned_chars: int = 0
+
+
+def parse_attributes(attr_text: str) -> Dict[str, str]:
+    """Parse tag attributes into a dict with lowercase names and unescaped values."""
+    attrs = {}
+    for match in _ATTR_PATTERN.finditer(attr_text):
+        value = next((v for v in match.groups()[1:] if v is not None), "")
+        attrs.setdefault(match.group(1).lower(), html.unescape(value))
+    return attrs
+
+
+def _has_series_name(items: List[Dict]) -> bool:
+    for item in items:
+        if item.get("@type") == "CreativeWorkSeries" and item.get("name"):
+            return True
+        if item.get("@type") == "PodcastEpisode":
+            series = item.get("partOfSeries")
+            if isinstance(series, dict) and series.get("name"):
+                return True
+    return False
+
+
+def _has_long_description(items: List[Dict]) -> bool:
+    return any(
+        item.get("@type") == "PodcastEpisode"
+        and len(item.get("description") or "") > LONG_DESCRIPTION_CHARS
+        for item in items
+    )
+
+
+def scan_metadata_tags(html_text: str) -> ScanResult:
+    """
+    Scan HTML for JSON-LD blocks, meta tags, <title> and the episode title span.
+
+    The scan stops as soon as the podcast name, a long episode description and
+    the episode title span have all been seen, so the bulk of a large page is
+    never visited.
+
+    Args:
+        html_text: Page HTML
+
+    Returns:
+        ScanResult with everything found before the scan stopped
+    """
+    result = ScanResult()
+
+    for match in _TAG_PATTERN.finditer(html_text):
+        if match.group("script_attrs") is not None:
+            attrs = parse_attributes(match.group("script_attrs"))
+            if attrs.get("type", "").lower() != "application/ld+json":
+                continue
+            try:
+                data = json.loads(match.group("script_body"))
+            except (TypeError, ValueError):
+                continue
+            for item in (data if isinstance(data, list) else [data]):
+                if isinstance(item, dict):
+                    result.json_ld.append(item)
+
+        elif match.group("meta_attrs") is not None:
+            attrs = parse_attributes(match.group("meta_attrs"))
+            key = attrs.get("property") or attrs.get("name")
+            content = attrs.get("content")
+            if key and content and key not in result.meta:
+                result.meta[key] = content
+
+        elif match.group("title") is not None:
+            if result.title is None:
+                result.title = html.unescape(match.group("title"))
+
+        elif result.episode_title is None and not result.episode_title_deferred:
+            attrs = parse_attributes(match.group("span_attrs"))
+            is_title_span = (
+                attrs.get("data-testid") == "episode-lockup-title"
+                or "episode-details__title-text" in attrs.get("class", "").split()
+            )
+            body = match.group("span_body")
+            if is_title_span:
+                text = html.unescape(_INNER_TAG_PATTERN.sub(" ", body))
+                text = " ".join(text.split())
+                # Nested spans would be cut short by the lazy match. Later title
+                # spans belong to related episodes, so the first one is left to
+                # the DOM rather than skipped.
+                if "<span" in body.lower() or not text:
+                    result.episode_title_deferred = True
+                else:
+                    result.episode_title = text
+
+        if ((result.episode_title or result.episode_title_deferred) and _has_series_name(result.json_ld)
+                and _has_long_description(result.json_ld)):
+            result.stopped_early = True
+            result.scanned_chars = match.end()
+            return result
+
+    result.scanned_chars = len(html_text)
+    return result
@@ -0,0 +1,295 @@
+"""Persistent on-disk HTTP response cache with conditional revalidation."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .config import Config
+from .http_client import HttpClient, get_http_client
+
+
+# Non-text/* content types worth caching; audio and other binaries are never stored
+CACHEABLE_CONTENT_TYPES = ("html", "xml", "json")
+
+# Content types that are refused outright instead of being read into memory
+BINARY_CONTENT_TYPES = ("audio/", "video/")
+
+
+@dataclass
+class CachedResponse:
+    """A response body served either from the network or from the cache."""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the charset from Content-Type, defaulting to UTF-8."""
+        encoding = "utf-8"
+        content_type = self.headers.get("Content-Type", "")
+        for part in content_type.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                encoding = value.strip('"\'')
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+
+class HttpCache:
+    """Caches page and feed responses on disk, revalidating with ETag/Last-Modified."""
+
+    def __init__(self, cache_folder: str = None, ttl_seconds: float = None,
+                 max_age_seconds: float = None, max_bytes: int = None,
+                 http_client: Optional[HttpClient] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Directory holding compressed bodies and entry metadata
+            ttl_seconds: Entries younger than this are served without a request
+            max_age_seconds: Entries not revalidated for this long are evicted
+            max_bytes: Compressed size budget; least recently used entries go first
+            http_client: Client used for network fetches
+        """
+        self.cache_folder = cache_folder or Config.HTTP_CACHE_FOLDER
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.HTTP_CACHE_TTL
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else Config.HTTP_CACHE_MAX_AGE
+        self.max_bytes = max_bytes if max_bytes is not None else Config.HTTP_CACHE_MAX_BYTES
+        self.http_client = http_client or get_http_client()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout=None) -> CachedResponse:
+        """
+        Fetch a URL through the cache.
+
+        Fresh entries are returned directly. Stale entries are revalidated with
+        If-None-Match / If-Modified-Since, so an unchanged resource costs a 304.
+
+        Args:
+            url: Resource URL
+            headers: Extra request headers
+            timeout: Optional requests timeout override
+
+        Returns:
+            CachedResponse for the resource
+
+        Raises:
+            requests.HTTPError: If the server answers with an error status
+        """
+        key = self._cache_key(url)
+        entry = self._load_entry(key)
+
+        if entry and time.time() - entry["stored_at"] < self.ttl_seconds:
+            body = self._read_body(key)
+            if body is not None:
+                self._increment("hits")
+                self._touch(key)
+                return self._cached_response(url, entry, body)
+            entry = None
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.http_client.get(url, headers=request_headers, stream=True,
+                                        timeout=timeout or self.http_client.timeout)
+
+        if response.status_code == 304 and entry:
+            response.close()
+            body = self._read_body(key)
+            if body is not None:
+                self._increment("hits")
+                self._increment("revalidated")
+                entry["stored_at"] = time.time()
+                entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+                entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+                self._write_entry(key, entry)
+                self._touch(key)
+                return self._cached_response(url, entry, body)
+            # Body vanished underneath us; fetch unconditionally
+            response = self.http_client.get(url, headers=headers, stream=True,
+                                            timeout=timeout or self.http_client.timeout)
+
+        if response.status_code >= 400:
+            # A streamed response holds its pooled connection until it is closed
+            response.close()
+            response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "").lower()
+        if content_type.startswith(BINARY_CONTENT_TYPES):
+            # Never pull a media file into memory just to read it as a document
+            response.close()
+            raise ValueError(f"Expected a document but got {content_type}: {url}")
+        self._increment("misses")
+
+        result = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            content=response.content,
+            headers={"Content-Type": response.headers.get("Content-Type", "")},
+            from_cache=False
+        )
+
+        if self._is_cacheable(response):
+            self._store(key, url, response, result.content)
+
+        return result
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and current disk usage."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["bytes_on_disk"] = sum(size for _, size, _ in self._body_files())
+        return stats
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for name in os.listdir(self.cache_folder):
+            if name.endswith((".json", ".gz")):
+                self._remove(os.path.join(self.cache_folder, name))
+
+    def evict(self) -> None:
+        """Drop entries past max age, then least recently used entries over the size budget."""
+        now = time.time()
+        files = sorted(self._body_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+
+        for key, size, last_access in files:
+            if total <= self.max_bytes and now - last_access <= self.max_age_seconds:
+                continue
+            entry = self._load_entry(key)
+            expired = not entry or now - entry["stored_at"] > self.max_age_seconds
+            if total > self.max_bytes or expired:
+                self._remove_entry(key)
+                total -= size
+                self._increment("evicted")
+
+    def _store(self, key: str, url: str, response, body: bytes) -> None:
+        """Write a compressed body and its validators to disk."""
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", ""),
+            "stored_at": time.time(),
+            "size": len(body)
+        }
+        try:
+            self._atomic_write(self._body_path(key), gzip.compress(body))
+            self._write_entry(key, entry)
+            self._increment("stored")
+            self.evict()
+        except OSError as e:
+            print(f"Error writing HTTP cache entry for {url}: {e}")
+
+    def _is_cacheable(self, response) -> bool:
+        """Only store text documents (pages, feeds, JSON) the server allows us to keep."""
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return False
+        content_type = response.headers.get("Content-Type", "").lower()
+        return content_type.startswith("text/") or any(
+            kind in content_type for kind in CACHEABLE_CONTENT_TYPES
+        )
+
+    def _cached_response(self, url: str, entry: Dict, body: bytes) -> CachedResponse:
+        return CachedResponse(
+            url=url,
+            status_code=200,
+            content=body,
+            headers={"Content-Type": entry.get("content_type", "")},
+            from_cache=True
+        )
+
+    def _cache_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, f"{key}.json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, f"{key}.gz")
+
+    def _load_entry(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key: str, entry: Dict) -> None:
+        self._atomic_write(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return gzip.decompress(f.read())
+        except (OSError, EOFError):
+            return None
+
+    def _touch(self, key: str) -> None:
+        """Record access time on the body file for LRU eviction."""
+        try:
+            os.utime(self._body_path(key))
+        except OSError:
+            pass
+
+    def _body_files(self):
+        """List (key, compressed size, last access) for every cached body."""
+        files = []
+        for name in os.listdir(self.cache_folder):
+            if not name.endswith(".gz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_folder, name))
+            except OSError:
+                continue
+            files.append((name[:-3], stat.st_size, stat.st_mtime))
+        return files
+
+    def _remove_entry(self, key: str) -> None:
+        self._remove(self._body_path(key))
+        self._remove(self._entry_path(key))
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Get the process-wide HTTP response cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+        return _shared_cache
@@ -0,0 +1,189 @@
+"""Shared pooled HTTP client with timeouts and retry/backoff."""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .config import Config
+
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Only methods without side effects are retried
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _counting_pool_class(base_class, on_new_connection, pool_timeout):
+    """Build a connection pool class that reports every new connection it opens.
+
+    The pools block when full, but only for pool_timeout seconds: a leaked
+    connection then raises EmptyPoolError instead of hanging every later
+    request to that host.
+    """
+
+    class CountingConnectionPool(base_class):
+        def _new_conn(self):
+            on_new_connection()
+            return super()._new_conn()
+
+        def _get_conn(self, timeout=None):
+            return super()._get_conn(timeout=pool_timeout if timeout is None else timeout)
+
+    return CountingConnectionPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTP adapter whose pools count the connections they open."""
+
+    def __init__(self, on_new_connection, pool_timeout: float, **kwargs):
+        self._on_new_connection = on_new_connection
+        self._pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._on_new_connection, self._pool_timeout),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._on_new_connection, self._pool_timeout),
+        }
+
+
+class HttpClient:
+    """Keep-alive HTTP session shared by every network component."""
+
+    def __init__(self, connect_timeout: float = None, read_timeout: float = None,
+                 pool_connections: int = None, pool_maxsize: int = None,
+                 max_retries: int = None, backoff_base: float = None, backoff_max: float = None):
+        """
+        Initialize the pooled session.
+
+        Args:
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait between bytes from the server
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum concurrent connections per host
+            max_retries: Retries for connection errors and 429/5xx responses
+            backoff_base: First backoff delay in seconds, doubled per attempt
+            backoff_max: Upper bound for a single backoff delay
+        """
+        self.connect_timeout = connect_timeout if connect_timeout is not None else Config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout if read_timeout is not None else Config.HTTP_READ_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Config.HTTP_MAX_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else Config.HTTP_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else Config.HTTP_BACKOFF_MAX
+
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "connections_opened": 0, "retries": 0}
+
+        adapter = _CountingAdapter(
+            self._record_new_connection,
+            pool_timeout=Config.HTTP_POOL_TIMEOUT,
+            pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+            pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def timeout(self):
+        """Default (connect, read) timeout tuple."""
+        return (self.connect_timeout, self.read_timeout)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures with jittered exponential backoff.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            The final response; 429/5xx responses are returned once retries run out
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        retryable = method.upper() in RETRY_METHODS
+        attempt = 0
+
+        while True:
+            self._increment("requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                if (not retryable or response.status_code not in RETRY_STATUS_CODES
+                        or attempt >= self.max_retries):
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self.backoff_delay(attempt)
+                response.close()
+
+            attempt += 1
+            self._increment("retries")
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """Send a HEAD request, following redirects."""
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get request, retry and connection reuse counters."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["connections_reused"] = max(0, stats["requests"] - stats["connections_opened"])
+        return stats
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Read a Retry-After header given in seconds, capped at backoff_max."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.backoff_max, max(0.0, float(value)))
+        except ValueError:
+            return None
+
+    def _record_new_connection(self) -> None:
+        self._increment("connections_opened")
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client shared by all sources."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
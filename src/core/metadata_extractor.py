@@ -1,116 +1,97 @@
 """Podcast metadata extraction from web pages."""
 
-import json
 import re
 import html
 from typing import Dict, Optional
-import requests
 from bs4 import BeautifulSoup, Comment
 
+from .html_scanner import LONG_DESCRIPTION_CHARS
+from .http_cache import HttpCache, get_http_cache
+from .page_snapshot import PageSnapshot
+
 
 class MetadataExtractor:
     """Extracts podcast metadata from web pages."""
     
-    def __init__(self, timeout: int = 15):
+    def __init__(self, timeout: int = 15, http_cache: Optional[HttpCache] = None):
         self.timeout = timeout
+        self._http_cache = http_cache
+    
+    @property
+    def http_cache(self) -> HttpCache:
+        """HTTP cache used for page fetches (the shared one unless injected)."""
+        if self._http_cache is None:
+            self._http_cache = get_http_cache()
+        return self._http_cache
     
-    def extract_podcast_title(self, url: str) -> str:
+    def fetch_page(self, url: str) -> PageSnapshot:
+        """Fetch and parse an episode page once for all extractors."""
+        return PageSnapshot.fetch(
+            url, self.http_cache, timeout=(self.http_cache.http_client.connect_timeout, self.timeout)
+        )
+    
+    def extract_podcast_title(self, url: str, page: Optional[PageSnapshot] = None) -> str:
         """Extract podcast channel name from page."""
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = page or self.fetch_page(url)
             
-            # Look through JSON-LD script tags
-            for script_tag in soup.find_all("script", type="application/ld+json"):
-                try:
-                    data = json.loads(script_tag.string)
-                    
-                    items = data if isinstance(data, list) else [data]
-                    
-                    for item in items:
-                        # Handle CreativeWorkSeries (for Apple Podcasts)
-                        if item.get("@type") == "CreativeWorkSeries":
-                            name = item.get("name")
-                            if name:
-                                return name
-                        # Handle PodcastEpisode
-                        elif item.get("@type") == "PodcastEpisode":
-                            series = item.get("partOfSeries")
-                            if isinstance(series, dict):
-                                name = series.get("name")
-                                if name:
-                                    return name
-                except (json.JSONDecodeError, TypeError):
-                    continue
+            # Look through JSON-LD items
+            for item in page.json_ld_items():
+                # Handle CreativeWorkSeries (for Apple Podcasts)
+                if item.get("@type") == "CreativeWorkSeries":
+                    name = item.get("name")
+                    if name:
+                        return name
+                # Handle PodcastEpisode
+                elif item.get("@type") == "PodcastEpisode":
+                    series = item.get("partOfSeries")
+                    if isinstance(series, dict):
+                        name = series.get("name")
+                        if name:
+                            return name
                     
         except Exception as e:
             print(f"Error extracting podcast title: {e}")
             
         return "untitled_podcast"
     
-    def extract_episode_title(self, url: str) -> str:
+    def extract_episode_title(self, url: str, page: Optional[PageSnapshot] = None) -> str:
         """Extract episode title from page."""
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = page or self.fetch_page(url)
 
             # Apple Podcasts page embeds the episode title in a visible title span
-            episode_title_elem = soup.select_one('span[data-testid="episode-lockup-title"], span.episode-details__title-text')
-            if episode_title_elem and episode_title_elem.get_text(strip=True):
-                title = episode_title_elem.get_text(separator=' ', strip=True)
-            else:
-                # Try Open Graph meta tag
-                og_title = soup.find("meta", property="og:title")
-                if og_title and og_title.get("content"):
-                    title = og_title["content"]
-                else:
-                    # Try meta name="title"
-                    meta_title = soup.find("meta", attrs={"name": "title"})
-                    if meta_title and meta_title.get("content"):
-                        title = meta_title["content"]
-                    else:
-                        # Fall back to title tag
-                        title = soup.title.string.strip() if soup.title and soup.title.string else "untitled_episode"
-
-            # Clean up the title
-            title = title.strip()
-            title = re.sub(r'[\r\n\t]+', ' ', title)
-            title = re.sub(r'\s+', ' ', title).strip()
-            title = title.replace("’", "'").replace("“", '"').replace("”", '"')
+            title = page.episode_title_text or self._episode_title_from_dom(page)
+            if not title:
+                # Try Open Graph meta tag, then meta name="title"
+                title = page.meta_content("og:title") or page.meta_content("title")
+            if not title:
+                # Fall back to title tag
+                title = page.title_text.strip() if page.title_text and page.title_text.strip() else "untitled_episode"
 
-            return title
+            return self.clean_title(title)
 
         except Exception as e:
             print(f"Error extracting episode title: {e}")
             return "untitled_episode"
     
-    def extract_episode_description(self, url: str) -> str:
+    def extract_episode_description(self, url: str, page: Optional[PageSnapshot] = None) -> str:
         """Extract full episode description from page."""
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            response.encoding = "utf-8"
-            soup = BeautifulSoup(response.text, "html.parser")
+            page = page or self.fetch_page(url)
             
             # Try JSON-LD first
             json_fallback = None
-            for tag in soup.find_all("script", type="application/ld+json"):
-                try:
-                    data = json.loads(tag.string)
-                except (TypeError, json.JSONDecodeError):
-                    continue
-                
-                for item in (data if isinstance(data, list) else [data]):
-                    if item.get("@type") == "PodcastEpisode":
-                        desc = item.get("description")
-                        if desc and len(desc) > 400:
-                            return desc.strip()
-                        json_fallback = desc or json_fallback
+            for item in page.json_ld_items("PodcastEpisode"):
+                desc = item.get("description")
+                if desc and len(desc) > LONG_DESCRIPTION_CHARS:
+                    return desc.strip()
+                json_fallback = desc or json_fallback
             
-            # Try HTML comment block
-            wrapper = soup.find("div", attrs={"data-testid": "paragraphs"})
+            # Try HTML comment block (the only part that needs the full DOM)
+            wrapper = None
+            if page.has_test_id("paragraphs"):
+                wrapper = page.soup.find("div", attrs={"data-testid": "paragraphs"})
             if wrapper:
                 paragraphs = []
                 
@@ -136,10 +117,42 @@ class MetadataExtractor:
             
         return "no_description_found"
     
-    def extract_all_metadata(self, url: str) -> Dict[str, str]:
-        """Extract all metadata from a podcast URL."""
+    def clean_title(self, title: str) -> str:
+        """Collapse whitespace and normalize curly quotes in a title."""
+        title = title.strip()
+        title = re.sub(r'[\r\n\t]+', ' ', title)
+        title = re.sub(r'\s+', ' ', title).strip()
+        title = title.replace("’", "'").replace("“", '"').replace("”", '"')
+        return title
+    
+    def _episode_title_from_dom(self, page: PageSnapshot) -> Optional[str]:
+        """Read the title span from the DOM when the scanner could not (e.g. nested markup)."""
+        if not (page.has_test_id("episode-lockup-title") or "episode-details__title-text" in page.html):
+            return None
+        
+        episode_title_elem = page.soup.select_one('span[data-testid="episode-lockup-title"], span.episode-details__title-text')
+        if episode_title_elem and episode_title_elem.get_text(strip=True):
+            return episode_title_elem.get_text(separator=' ', strip=True)
+        return None
+    
+    def extract_from_page(self, page: PageSnapshot) -> Dict[str, str]:
+        """Extract all metadata from an already fetched page snapshot."""
         return {
-            "podcast_title": self.extract_podcast_title(url),
-            "episode_title": self.extract_episode_title(url),
-            "episode_description": self.extract_episode_description(url)
+            "podcast_title": self.extract_podcast_title(page.url, page),
+            "episode_title": self.extract_episode_title(page.url, page),
+            "episode_description": self.extract_episode_description(page.url, page)
         }
+    
+    def extract_all_metadata(self, url: str) -> Dict[str, str]:
+        """Extract all metadata from a podcast URL with a single fetch and parse."""
+        try:
+            page = self.fetch_page(url)
+        except Exception as e:
+            print(f"Error fetching page: {e}")
+            return {
+                "podcast_title": "untitled_podcast",
+                "episode_title": "untitled_episode",
+                "episode_description": "no_description_found"
+            }
+        
+        return self.extract_from_page(page)
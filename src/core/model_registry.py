@@ -0,0 +1,297 @@
+"""Process-wide registry of loaded speech-to-text models."""
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .config import Config
+
+
+def load_whisper_model(model_name: str) -> Any:
+    """Default loader: an openai-whisper model by size name."""
+    import whisper
+    return whisper.load_model(model_name)
+
+
+def model_resident_bytes(model: Any) -> int:
+    """Bytes held by a torch model's parameters and buffers (0 if it isn't one)."""
+    total = 0
+    for attribute in ("parameters", "buffers"):
+        tensors = getattr(model, attribute, None)
+        if callable(tensors):
+            try:
+                total += sum(t.numel() * t.element_size() for t in tensors())
+            except Exception:
+                pass
+    return total
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class _ModelEntry:
+    """A model slot: the loaded model (if any) plus its metrics."""
+    name: str
+    model: Any = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    exclusive_lock: threading.Lock = field(default_factory=threading.Lock)
+    in_use: int = 0
+    loads: int = 0
+    uses: int = 0
+    load_seconds: float = 0.0
+    resident_bytes: int = 0
+    last_used: float = 0.0
+
+
+class ModelRegistry:
+    """Loads each model at most once per process and shares it across transcribers.
+
+    Models are unloaded after sitting idle for ``idle_seconds`` and, least
+    recently used first, when the loaded models exceed ``max_resident_bytes``.
+    A model handed out by use() is never unloaded while the block runs, and
+    use(exclusive=True) serializes the blocks of models that aren't safe to
+    run from several threads at once.
+    """
+
+    def __init__(self, idle_seconds: float = None, max_resident_bytes: int = None,
+                 loader: Optional[Callable[[str], Any]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            idle_seconds: Unload models unused for this long (0 keeps them loaded)
+            max_resident_bytes: Memory cap across loaded models (0 for no cap)
+            loader: Default function loading a model by name
+        """
+        self.idle_seconds = idle_seconds if idle_seconds is not None else Config.MODEL_IDLE_UNLOAD
+        self.max_resident_bytes = max_resident_bytes if max_resident_bytes is not None else Config.MODEL_MAX_RESIDENT_BYTES
+        self.loader = loader or load_whisper_model
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._warming = set()
+
+    def get(self, name: str, loader: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Get a model, loading it on first use.
+
+        Concurrent callers asking for the same model wait for a single load.
+
+        Args:
+            name: Registry key, e.g. a Whisper model size
+            loader: Loader for this model, overriding the registry default
+
+        Returns:
+            The loaded model
+        """
+        entry = self._entry(name)
+        with entry.lock:
+            if entry.model is None:
+                print(f"Loading model: {name}")
+                start = time.perf_counter()
+                entry.model = (loader or self.loader)(name)
+                entry.load_seconds = time.perf_counter() - start
+                entry.resident_bytes = model_resident_bytes(entry.model)
+                entry.loads += 1
+                print(f"Loaded model {name} in {entry.load_seconds:.1f}s "
+                      f"({entry.resident_bytes / (1024 * 1024):.0f} MB)")
+            entry.uses += 1
+            entry.last_used = time.time()
+            model = entry.model
+
+        self._enforce_memory_cap(keep=name)
+        self._start_reaper()
+        return model
+
+    @contextmanager
+    def use(self, name: str, loader: Optional[Callable[[str], Any]] = None,
+            exclusive: bool = False) -> Iterator[Any]:
+        """
+        Context manager holding a model loaded for the duration of the block.
+
+        Args:
+            name: Registry key
+            loader: Loader for this model, overriding the registry default
+            exclusive: Wait until no other exclusive block holds the model
+        """
+        entry = self._entry(name)
+        with self._lock:
+            entry.in_use += 1
+        try:
+            if exclusive:
+                with entry.exclusive_lock:
+                    yield self.get(name, loader)
+            else:
+                yield self.get(name, loader)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.time()
+
+    def prewarm(self, names: Iterable[str],
+                loader: Optional[Callable[[str], Any]] = None) -> Optional[threading.Thread]:
+        """
+        Load models in a background thread so the first job doesn't wait for them.
+
+        Models already loaded or being warmed are skipped, so this is safe to
+        call on every app start or rerun.
+
+        Args:
+            names: Models to load
+            loader: Loader for these models, overriding the registry default
+
+        Returns:
+            The started warm-up thread, or None if there was nothing to load
+        """
+        with self._lock:
+            names = [
+                name for name in names
+                if name not in self._warming and not (name in self._entries and self._entries[name].model is not None)
+            ]
+            self._warming.update(names)
+        if not names:
+            return None
+
+        def warm():
+            for name in names:
+                try:
+                    self.get(name, loader)
+                except Exception as e:
+                    print(f"Error pre-warming model {name}: {e}")
+                finally:
+                    with self._lock:
+                        self._warming.discard(name)
+
+        thread = threading.Thread(target=warm, name="model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry is not None and entry.model is not None
+
+    def unload(self, name: str) -> bool:
+        """Unload a model unless it is in use; returns whether it was unloaded."""
+        entry = self._entry(name)
+        with entry.lock:
+            with self._lock:
+                if entry.model is None or entry.in_use:
+                    return False
+                entry.model = None
+                entry.resident_bytes = 0
+        print(f"Unloaded model: {name}")
+        _release_memory()
+        return True
+
+    def unload_idle(self) -> None:
+        """Unload every model unused for longer than idle_seconds."""
+        if not self.idle_seconds:
+            return
+        now = time.time()
+        with self._lock:
+            idle = [
+                entry.name for entry in self._entries.values()
+                if entry.model is not None and not entry.in_use and now - entry.last_used > self.idle_seconds
+            ]
+        for name in idle:
+            self.unload(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Load times, use counts and resident memory of every known model."""
+        with self._lock:
+            models = {
+                entry.name: {
+                    "loaded": entry.model is not None,
+                    "in_use": entry.in_use,
+                    "loads": entry.loads,
+                    "uses": entry.uses,
+                    "load_seconds": round(entry.load_seconds, 2),
+                    "resident_bytes": entry.resident_bytes,
+                    "idle_seconds": round(time.time() - entry.last_used, 1) if entry.last_used else None
+                }
+                for entry in self._entries.values()
+            }
+        return {
+            "models": models,
+            "resident_bytes": sum(model["resident_bytes"] for model in models.values()),
+            "process_rss_bytes": process_rss_bytes()
+        }
+
+    def _entry(self, name: str) -> _ModelEntry:
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(name)
+            return self._entries[name]
+
+    def _enforce_memory_cap(self, keep: str) -> None:
+        """Unload least recently used models until the loaded ones fit the memory cap."""
+        if not self.max_resident_bytes:
+            return
+        with self._lock:
+            loaded = sorted(
+                (entry for entry in self._entries.values() if entry.model is not None),
+                key=lambda entry: entry.last_used
+            )
+            total = sum(entry.resident_bytes for entry in loaded)
+        for entry in loaded:
+            if total <= self.max_resident_bytes:
+                break
+            size = entry.resident_bytes
+            if entry.name != keep and self.unload(entry.name):
+                total -= size
+
+    def _start_reaper(self) -> None:
+        """Start the idle-unload thread once the first model is loaded."""
+        if not self.idle_seconds:
+            return
+        with self._lock:
+            if self._reaper and self._reaper.is_alive():
+                return
+            interval = min(60.0, max(1.0, self.idle_seconds / 4))
+
+            def reap():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.unload_idle()
+                    except Exception as e:
+                        print(f"Error unloading idle models: {e}")
+
+            self._reaper = threading.Thread(target=reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+
+def _release_memory() -> None:
+    """Return freed model memory to the allocator (and the GPU, when one is used)."""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+_shared_registry: Optional[ModelRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry shared by every transcriber."""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = ModelRegistry()
+        return _shared_registry
@@ -0,0 +1,65 @@
+"""Parsed snapshot of a podcast episode web page."""
+
+import re
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+
+from .http_cache import HttpCache, get_http_cache
+from .html_scanner import scan_metadata_tags
+
+
+class PageSnapshot:
+    """A web page fetched once, with JSON-LD blocks and meta tags pre-indexed.
+
+    The page is indexed with a fast tag scanner; the full BeautifulSoup DOM is
+    only built on first access to ``soup``.
+    """
+
+    def __init__(self, url: str, html_text: str):
+        """
+        Scan page HTML and index the parts metadata extraction reads.
+
+        Args:
+            url: URL the page was fetched from
+            html_text: Decoded page HTML
+        """
+        self.url = url
+        self.html = html_text
+        self.scan = scan_metadata_tags(html_text)
+        self.json_ld = self.scan.json_ld
+        self.meta = self.scan.meta
+        self.title_text = self.scan.title
+        self.episode_title_text = self.scan.episode_title
+        self._soup = None
+
+    @classmethod
+    def fetch(cls, url: str, http_cache: Optional[HttpCache] = None, timeout=None) -> "PageSnapshot":
+        """Fetch a page once (through the HTTP cache) and build its snapshot."""
+        response = (http_cache or get_http_cache()).get(url, timeout=timeout)
+        return cls(url, response.text)
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Full DOM of the page, parsed lazily on first use."""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def has_dom(self) -> bool:
+        """Whether the full DOM has been built."""
+        return self._soup is not None
+
+    def has_test_id(self, test_id: str) -> bool:
+        """Cheap check for a data-testid attribute without building the DOM."""
+        return re.search(r'data-testid\s*=\s*["\']%s["\']' % re.escape(test_id), self.html) is not None
+
+    def json_ld_items(self, item_type: Optional[str] = None) -> List[Dict]:
+        """Return JSON-LD items, optionally only those of the given @type."""
+        if item_type is None:
+            return list(self.json_ld)
+        return [item for item in self.json_ld if item.get("@type") == item_type]
+
+    def meta_content(self, key: str) -> Optional[str]:
+        """Return the content of a <meta> tag by its property or name attribute."""
+        return self.meta.get(key)
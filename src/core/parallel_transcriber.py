@@ -0,0 +1,160 @@
+"""Parallel transcription of long episodes split at silences."""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .config import Config
+from .pcm_cache import get_pcm_cache, mapped_file
+from .stream_decoder import SAMPLE_RATE
+from .transcription_engines import shift_segment, stitch_windows
+from .vad import SpeechWindow, split_windows
+
+# Engine of a worker process, created by _init_worker
+_worker_engine = None
+# PCM files the worker has memory-mapped, by path
+_worker_pcm: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(engine_name: str, model_name: str, cpu_threads: int) -> None:
+    """Create the worker's engine; its model loads on the first window."""
+    global _worker_engine
+    from .transcription_engines import create_engine
+    from .model_registry import ModelRegistry
+
+    Config.TRANSCRIPTION_CPU_THREADS = cpu_threads
+    Config.TRANSCRIPTION_NUM_WORKERS = 1
+    _worker_engine = create_engine(engine_name, model_name, ModelRegistry(idle_seconds=0, max_resident_bytes=0))
+
+
+def _transcribe_window(window: Union[np.ndarray, Tuple[str, int, int]], options: Dict) -> Dict:
+    """Transcribe a window's samples, or a (pcm_path, start, end) slice of a cached PCM file."""
+    if isinstance(window, tuple):
+        path, start, end = window
+        if path not in _worker_pcm:
+            if len(_worker_pcm) >= 4:
+                _worker_pcm.clear()
+            _worker_pcm[path] = np.load(path, mmap_mode="r")
+        window = _worker_pcm[path][start:end]
+    return _worker_engine.transcribe(window, **options)
+
+
+class ParallelTranscriber:
+    """Transcribes VAD windows of one episode across a pool of worker processes.
+
+    Each worker loads its own copy of the model once and keeps it for the
+    life of the pool. Results are stitched back in order with timestamps
+    shifted to the window's position in the episode.
+    """
+
+    def __init__(self, engine_name: str = None, model_name: str = None, workers: int = None):
+        """
+        Initialize the transcriber.
+
+        Args:
+            engine_name: Transcription engine (Config.TRANSCRIPTION_ENGINE by default)
+            model_name: Whisper model size (Config.WHISPER_MODEL by default)
+            workers: Worker processes (Config.TRANSCRIPTION_WORKERS by default)
+        """
+        self.engine_name = engine_name or Config.TRANSCRIPTION_ENGINE
+        self.model_name = model_name or Config.WHISPER_MODEL
+        self.workers = max(1, workers or Config.TRANSCRIPTION_WORKERS)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Worker pool, started on first use."""
+        if self._pool is None:
+            # Split the cores between workers instead of letting each one use all of them
+            cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.engine_name, self.model_name, cpu_threads)
+            )
+        return self._pool
+
+    def transcribe(self, audio: np.ndarray, options: Optional[Dict] = None) -> Dict:
+        """
+        Transcribe 16 kHz mono PCM window by window in parallel.
+
+        Args:
+            audio: Float32 samples in [-1, 1]
+            options: Decoding options passed to each window's transcription
+
+        Returns:
+            Whisper-format result (text, segments, language) for the whole episode
+        """
+        windows = split_windows(audio)
+        speech_seconds = sum(window.duration_seconds for window in windows)
+        print(f"Transcribing {len(windows)} windows ({speech_seconds:.0f}s of speech in "
+              f"{len(audio) / SAMPLE_RATE:.0f}s of audio) on {self.workers} workers")
+
+        start = time.perf_counter()
+        results = list(self.map_windows(audio, windows, options))
+        print(f"Parallel transcription took {time.perf_counter() - start:.1f}s")
+
+        return self.stitch(list(zip(windows, results)))
+
+    def iter_segments(self, audio: np.ndarray, options: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield episode-time segments window by window, as soon as each window (and all before it) is done."""
+        windows = split_windows(audio)
+        results = self.map_windows(audio, windows, options)
+        segment_id = 0
+        for window, result in zip(windows, results):
+            for segment in result.get("segments", []):
+                yield shift_segment(segment, window.start_seconds, segment_id)
+                segment_id += 1
+
+    def map_windows(self, audio: np.ndarray, windows: List[SpeechWindow],
+                    options: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Transcribe windows on the pool, yielding each window's result in order.
+
+        Memory-mapped PCM from the PCM cache is passed as (path, start, end), so
+        workers map the same file instead of receiving a pickled copy. The file
+        is registered with the cache until the last window is done, so a
+        concurrent job's eviction can't delete it before every worker opened it.
+        """
+        transcribe = partial(_transcribe_window, options=options or {})
+        path = mapped_file(audio)
+        if not path:
+            yield from self.pool.map(transcribe, (audio[w.start:w.end] for w in windows))
+            return
+
+        pcm_cache = get_pcm_cache()
+        pcm_cache.register(path)
+        try:
+            yield from self.pool.map(transcribe, ((path, w.start, w.end) for w in windows))
+        finally:
+            pcm_cache.unregister(path)
+
+    def stitch(self, window_results: List[Tuple[SpeechWindow, Dict]]) -> Dict:
+        """Merge per-window results in order, shifting timestamps to episode time."""
+        return stitch_windows(window_results)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_shared_transcribers: Dict[Tuple[str, str], ParallelTranscriber] = {}
+_shared_transcribers_lock = threading.Lock()
+
+
+def get_parallel_transcriber(engine_name: str, model_name: str) -> ParallelTranscriber:
+    """Get the process-wide parallel transcriber for an engine and model, so sessions share one pool."""
+    with _shared_transcribers_lock:
+        key = (engine_name, model_name)
+        if key not in _shared_transcribers:
+            _shared_transcribers[key] = ParallelTranscriber(engine_name, model_name)
+        return _shared_transcribers[key]
@@ -0,0 +1,194 @@
+"""On-disk cache of decoded 16 kHz PCM, read back as memory-mapped arrays."""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .audio_cache import file_content_hash
+from .config import Config
+from .stream_decoder import StreamingDecoder
+
+# Files worker processes are reading by path, with a count per job, across every cache in this process
+_active_paths: Dict[str, int] = {}
+_active_lock = threading.Lock()
+
+
+def mapped_file(audio: np.ndarray) -> Optional[str]:
+    """
+    Path of the .npy file an array maps in full, if it is one.
+
+    Lets callers hand another process the file name instead of pickling
+    the samples.
+    """
+    if not isinstance(audio, np.memmap) or not audio.filename or not audio.flags.c_contiguous:
+        return None
+    try:
+        whole = np.load(audio.filename, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return audio.filename if whole.shape == audio.shape and whole.dtype == audio.dtype else None
+
+
+class PcmCache:
+    """Keeps decoded audio as .npy files so an episode is only run through ffmpeg once.
+
+    Files are keyed by the SHA-256 of the source audio and opened with
+    ``mmap_mode="r"``: slicing one is zero-copy, pages are shared between
+    every process that maps the same file, and only the parts actually read
+    are loaded. Least recently used files are evicted past ``max_bytes``.
+    """
+
+    def __init__(self, cache_folder: str = None, max_bytes: int = None,
+                 decoder: Optional[StreamingDecoder] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Directory holding the .npy files
+            max_bytes: Size budget (float32 PCM is about 230 MB per hour of audio)
+            decoder: Decoder for cache misses
+        """
+        self.cache_folder = cache_folder or Config.PCM_CACHE_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else Config.PCM_CACHE_MAX_BYTES
+        self.decoder = decoder or StreamingDecoder()
+        self._lock = threading.Lock()
+        # (path, size, mtime) -> content hash, so a file is hashed once per process
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._stats = {"hits": 0, "misses": 0, "evicted": 0}
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def key(self, audio_path: str) -> str:
+        """Content hash of an audio file."""
+        stat = os.stat(audio_path)
+        identity = (os.path.abspath(audio_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if identity not in self._hashes:
+                self._hashes[identity] = file_content_hash(audio_path)
+            return self._hashes[identity]
+
+    def get(self, audio_path: str) -> np.ndarray:
+        """
+        Decoded PCM of an audio file, decoding and caching it on a miss.
+
+        Args:
+            audio_path: Path to the source audio
+
+        Returns:
+            Read-only memory-mapped float32 samples
+        """
+        key = self.key(audio_path)
+        audio = self.lookup(key)
+        if audio is not None:
+            return audio
+
+        self._stats["misses"] += 1
+        return self.put(key, self.decoder.decode_file(audio_path).audio)
+
+    def lookup(self, key: str) -> Optional[np.ndarray]:
+        """Memory-map cached PCM, or None if the key isn't cached."""
+        path = self.path(key)
+        try:
+            audio = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        # mtime is the LRU clock
+        os.utime(path)
+        self._stats["hits"] += 1
+        return audio
+
+    def put(self, key: str, audio: np.ndarray) -> np.ndarray:
+        """
+        Cache decoded PCM under a key.
+
+        Args:
+            key: Content hash of the source audio
+            audio: Float32 samples
+
+        Returns:
+            The cached copy, memory-mapped
+        """
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        np.save(tmp_path, np.asarray(audio, dtype=np.float32))
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="r")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, f"{key}.npy")
+
+    def register(self, path: str) -> None:
+        """Protect a cached file from eviction while other processes open it by path."""
+        path = os.path.abspath(path)
+        with _active_lock:
+            _active_paths[path] = _active_paths.get(path, 0) + 1
+
+    def unregister(self, path: str) -> None:
+        """Release a file registered with register()."""
+        path = os.path.abspath(path)
+        with _active_lock:
+            if _active_paths.get(path, 0) > 1:
+                _active_paths[path] -= 1
+            else:
+                _active_paths.pop(path, None)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used files until the cache fits its budget.
+
+        Registered files are skipped. Other files still mapped in this process
+        stay readable until unmapped (only the directory entry goes), but a
+        process that has yet to open one would find it gone.
+        """
+        with self._lock:
+            files = []
+            for name in os.listdir(self.cache_folder):
+                if not name.endswith(".npy") or ".tmp" in name:
+                    continue
+                path = os.path.join(self.cache_folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path == keep or self._is_active(path):
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    self._stats["evicted"] += 1
+                except OSError:
+                    pass
+
+    def _is_active(self, path: str) -> bool:
+        with _active_lock:
+            return os.path.abspath(path) in _active_paths
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counts plus current size."""
+        with self._lock:
+            stats = dict(self._stats)
+        paths = [os.path.join(self.cache_folder, name) for name in os.listdir(self.cache_folder)
+                 if name.endswith(".npy") and ".tmp" not in name]
+        stats["files"] = len(paths)
+        stats["bytes"] = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+        return stats
+
+
+_shared_cache: Optional[PcmCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_pcm_cache() -> PcmCache:
+    """Get the process-wide PCM cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PcmCache()
+        return _shared_cache
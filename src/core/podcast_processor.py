@@ -1,15 +1,21 @@
 """Main transcript processing orchestrator supporting multiple sources."""
 
 import os
-from typing import Dict, Optional, Tuple
+import queue
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .config import Config
 from .speaker_identifier import SpeakerIdentifier
 from .transcript_cleaner import TranscriptCleaner
 from .document_generator import DocumentGenerator
-from .transcript_source import TranscriptSource
+from .transcript_source import TranscriptSource, TranscriptMetadata
+from .segment_store import SegmentStore
+from .decode_profiles import get_decode_profile
 from .podcast_source import PodcastSource
 from .youtube_source import YouTubeSource
+from .storage_manager import get_storage_manager
+from .stream_decoder import StreamTimings
 
 
 class TranscriptProcessor:
@@ -32,11 +38,16 @@ class TranscriptProcessor:
         )
         self.document_generator = DocumentGenerator(Config.TRANSCRIPT_FOLDER)
         
+        # Sweep downloads left behind by earlier runs, then keep sweeping in the background
+        self.storage_manager = get_storage_manager()
+        self.storage_manager.start_periodic_sweep()
+        
         # Initialize transcript sources
         self.sources = {
             "podcast": PodcastSource(
                 download_folder=Config.DOWNLOAD_FOLDER,
-                whisper_model=Config.WHISPER_MODEL
+                whisper_model=Config.WHISPER_MODEL,
+                storage_manager=self.storage_manager
             ),
             "youtube": YouTubeSource()
         }
@@ -55,13 +66,15 @@ class TranscriptProcessor:
         
         return self.sources[source_type].validate_url(url)
     
-    def process_transcript(self, source_type: str, url: str) -> Tuple[str, str]:
+    def process_transcript(self, source_type: str, url: str,
+                           decode_profile: Optional[str] = None) -> Tuple[str, str]:
         """
         Process a transcript from any supported source.
         
         Args:
             source_type: Type of source ("podcast" or "youtube")
             url: URL of the content
+            decode_profile: Decode profile for audio transcription (Config.DECODE_PROFILE by default)
             
         Returns:
             Tuple of (raw_document_path, cleaned_document_path)
@@ -71,12 +84,17 @@ class TranscriptProcessor:
         # Validate source type
         if source_type not in self.sources:
             raise ValueError(f"Unsupported source type: {source_type}")
+        # Fail on an unknown profile before any downloading
+        get_decode_profile(decode_profile)
         
         source = self.sources[source_type]
         
+        if Config.STREAMING_TRANSCRIPTION:
+            return self._process_streaming(source, url, decode_profile)
+        
         # Step 1: Extract transcript and metadata
         print("Extracting transcript and metadata...")
-        transcript_result = source.extract_transcript(url)
+        transcript_result = source.extract_transcript(url, decode_profile)
         metadata = transcript_result.metadata
         
         print(f"Title: {metadata.title}")
@@ -84,31 +102,15 @@ class TranscriptProcessor:
         print(f"Type: {metadata.source_type}")
         
         # Step 2: Identify speakers
-        print("Identifying speakers...")
-        speakers = self.speaker_identifier.extract_speakers(
-            metadata.source_name, metadata.title, metadata.description
-        )
-        
-        # For YouTube, adjust the description format
-        if metadata.source_type == "youtube":
-            content_description = f"a YouTube video from {metadata.source_name}"
-        else:
-            content_description = self.speaker_identifier.format_speaker_description(
-                speakers, metadata.source_name
-            )
-        
-        print(f"Host: {speakers['host']}")
-        if speakers["cohosts"]:
-            print(f"Co-hosts: {', '.join(speakers['cohosts'])}")
-        if speakers["guests"]:
-            print(f"Guests: {', '.join(speakers['guests'])}")
+        speakers, content_description = self._identify_speakers(metadata)
         
         # Step 3: Generate raw transcript document
         print("Generating raw transcript document...")
         raw_doc_path = self.document_generator.create_document(
             metadata.title, metadata.source_name, speakers, 
-            transcript_result.raw_text, cleaned=False
+            transcript_result.raw_text, cleaned=False, decode_profile=transcript_result.decode_profile
         )
+        self._save_segments(metadata, transcript_result.segments)
 
         # Step 4: Cleanup (for podcast sources)
         if hasattr(source, 'cleanup'):
@@ -124,18 +126,123 @@ class TranscriptProcessor:
         print("Generating cleaned transcript document...")
         cleaned_doc_path = self.document_generator.create_document(
             metadata.title, metadata.source_name, speakers, 
-            cleaned_transcript, cleaned=True
+            cleaned_transcript, cleaned=True, decode_profile=transcript_result.decode_profile
         )
                 
         print("Processing completed successfully!")
         return raw_doc_path, cleaned_doc_path
     
+    def _process_streaming(self, source: TranscriptSource, url: str,
+                           decode_profile: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Process a transcript with transcription and cleaning overlapped.
+        
+        Segments are transcribed on a background thread while speakers are
+        identified and complete chunks are cleaned, so total time approaches
+        the slower of the two stages instead of their sum.
+        """
+        print("Extracting metadata and audio...")
+        stream = source.stream_transcript(url, decode_profile)
+        metadata = stream.metadata
+        
+        print(f"Title: {metadata.title}")
+        print(f"Source: {metadata.source_name}")
+        print(f"Type: {metadata.source_type}")
+        
+        timings = StreamTimings()
+        raw_segments: List[Dict] = []
+        
+        def segment_texts() -> Iterator[str]:
+            for segment in stream.segments:
+                timings.mark("first_segment")
+                raw_segments.append(segment)
+                yield segment["text"]
+            timings.mark("transcription_done")
+        
+        # Transcription starts now and runs alongside speaker identification and cleaning
+        print("Transcribing and cleaning...")
+        texts = _iter_in_background(segment_texts())
+        speakers, content_description = self._identify_speakers(metadata)
+        
+        cleaned_chunks = []
+        for cleaned_chunk in self.transcript_cleaner.clean_stream(texts, content_description, speakers):
+            timings.mark("first_cleaned_chunk")
+            cleaned_chunks.append(cleaned_chunk)
+        timings.mark("cleaning_done")
+        raw_text = "".join(segment["text"] for segment in raw_segments).strip()
+        
+        print("Generating raw transcript document...")
+        raw_doc_path = self.document_generator.create_document(
+            metadata.title, metadata.source_name, speakers,
+            raw_text, cleaned=False, decode_profile=stream.decode_profile
+        )
+        if raw_segments and "start" in raw_segments[0]:
+            self._save_segments(metadata, SegmentStore.from_segments(raw_segments))
+        
+        if hasattr(source, 'cleanup'):
+            source.cleanup()
+        
+        print("Generating cleaned transcript document...")
+        cleaned_doc_path = self.document_generator.create_document(
+            metadata.title, metadata.source_name, speakers,
+            "\n".join(cleaned_chunks), cleaned=True, decode_profile=stream.decode_profile
+        )
+        
+        print(f"Streaming timings: {timings.summary()}")
+        print("Processing completed successfully!")
+        return raw_doc_path, cleaned_doc_path
+    
+    def _save_segments(self, metadata: TranscriptMetadata, segments: Optional[SegmentStore]) -> Optional[str]:
+        """Save an episode's timed segments next to its transcripts, if there are any."""
+        if not Config.SAVE_SEGMENTS or segments is None or not len(segments):
+            return None
+        segments_path = self.document_generator.get_segments_path(metadata.title)
+        segments.save(segments_path)
+        print(f"Saved {len(segments)} segments ({segments.nbytes / 1024:.0f} KiB): {segments_path}")
+        return segments_path
+    
+    def _identify_speakers(self, metadata: TranscriptMetadata) -> Tuple[Dict, str]:
+        """Identify speakers and build the content description used in cleaning prompts."""
+        print("Identifying speakers...")
+        speakers = self.speaker_identifier.extract_speakers(
+            metadata.source_name, metadata.title, metadata.description
+        )
+        
+        # For YouTube, adjust the description format
+        if metadata.source_type == "youtube":
+            content_description = f"a YouTube video from {metadata.source_name}"
+        else:
+            content_description = self.speaker_identifier.format_speaker_description(
+                speakers, metadata.source_name
+            )
+        
+        print(f"Host: {speakers['host']}")
+        if speakers["cohosts"]:
+            print(f"Co-hosts: {', '.join(speakers['cohosts'])}")
+        if speakers["guests"]:
+            print(f"Guests: {', '.join(speakers['guests'])}")
+        
+        return speakers, content_description
+    
     def get_processing_status(self) -> Dict[str, str]:
         """Get current processing status and configuration."""
+        usage = self.storage_manager.usage()
+        engine = self.sources["podcast"].transcriber.engine
+        model_stats = engine.model_registry.get_stats()["models"].get(engine.registry_key)
         return {
             "whisper_model": Config.WHISPER_MODEL,
+            "transcription_engine": engine.name,
+            "whisper_model_state": (
+                f"loaded in {model_stats['load_seconds']:.1f}s, "
+                f"{model_stats['resident_bytes'] / (1024 * 1024):.0f} MB resident"
+                if model_stats and model_stats["loaded"] else "not loaded"
+            ),
+            "decode_profile": get_decode_profile().label,
+            "refine_model": Config.REFINE_MODEL or "off",
             "openai_model": Config.OPENAI_MODEL,
             "download_folder": Config.DOWNLOAD_FOLDER,
+            "download_usage": f"{usage['bytes'] / (1024 * 1024):.0f} MB in {usage['files']} files "
+                              f"(budget {usage['max_bytes'] / (1024 * 1024):.0f} MB)",
             "transcript_folder": Config.TRANSCRIPT_FOLDER,
             "max_tokens_input": str(Config.MAX_TOKENS_INPUT),
             "max_tokens_output": str(Config.MAX_TOKENS_OUTPUT),
@@ -143,6 +250,33 @@ class TranscriptProcessor:
         }
 
 
+def _iter_in_background(items: Iterable) -> Iterator:
+    """Run an iterator on a background thread, handing its items over through a queue."""
+    handoff: queue.Queue = queue.Queue()
+    done = object()
+    
+    def produce():
+        try:
+            for item in items:
+                handoff.put((item, None))
+        except Exception as e:
+            handoff.put((None, e))
+        handoff.put((done, None))
+    
+    def consume():
+        while True:
+            item, error = handoff.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    
+    # Started here rather than inside a generator, so production begins before the first next()
+    threading.Thread(target=produce, name="transcription-stream", daemon=True).start()
+    return consume()
+
+
 # Keep the old class name for backward compatibility
 class PodcastProcessor(TranscriptProcessor):
     """Legacy class name for backward compatibility."""
@@ -1,24 +1,38 @@
 """Podcast transcript source implementation."""
 
-import os
 import re
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple, Union
+import numpy as np
 
-from .transcript_source import TranscriptSource, TranscriptMetadata, TranscriptResult
+from .transcript_source import TranscriptSource, TranscriptMetadata, TranscriptResult, TranscriptStream
 from .metadata_extractor import MetadataExtractor
 from .audio_downloader import AudioDownloader
+from .audio_metadata import AudioMetadataReader
+from .spotify_metadata import SpotifyMetadataExtractor
+from .feed_resolver import FeedResolver, FeedEpisode
 from .transcriber import Transcriber
+from .decode_profiles import get_decode_profile
+from .storage_manager import StorageManager
+from .config import Config
+from .stream_decoder import StreamTimings
 
 
 class PodcastSource(TranscriptSource):
     """Podcast transcript source using Whisper."""
     
-    def __init__(self, download_folder: str = "downloads", whisper_model: str = "base"):
+    def __init__(self, download_folder: str = "downloads", whisper_model: str = "base",
+                 storage_manager: Optional[StorageManager] = None):
         self.source_type = "podcast"
         self.metadata_extractor = MetadataExtractor()
-        self.audio_downloader = AudioDownloader(download_folder)
+        self.storage_manager = storage_manager or StorageManager(download_folder)
+        self.audio_downloader = AudioDownloader(download_folder, storage_manager=self.storage_manager)
         self.transcriber = Transcriber(whisper_model)
+        self.feed_resolver = FeedResolver()
+        self.audio_metadata_reader = AudioMetadataReader()
+        self.spotify_metadata_extractor = SpotifyMetadataExtractor()
         self._audio_path = None
+        self._episode: Optional[FeedEpisode] = None
+        self.last_stream_timings: Optional[StreamTimings] = None
     
     def validate_url(self, url: str) -> bool:
         """Validate podcast URL."""
@@ -33,12 +47,42 @@ class PodcastSource(TranscriptSource):
         )
     
     def extract_metadata(self, url: str) -> TranscriptMetadata:
-        """Extract podcast episode metadata."""
+        """Extract podcast episode metadata, preferring the show's RSS feed."""
         try:
-            metadata = self.metadata_extractor.extract_all_metadata(url)
+            self._episode = None
+            metadata = None
+            
+            if self._is_direct_audio(url):
+                # Read ID3 tags with a few KB of Range requests instead of fetching the file
+                metadata = self.audio_metadata_reader.read(url)
+            elif SpotifyMetadataExtractor.episode_id(url):
+                # Spotify pages carry no usable JSON-LD; the embed JSON names title and show
+                metadata = self.spotify_metadata_extractor.extract_all_metadata(url)
+                self._episode = self.feed_resolver.resolve(
+                    url, metadata["podcast_title"], metadata["episode_title"]
+                )
+            else:
+                # Apple URLs resolve by GUID without touching the episode page
+                self._episode = self.feed_resolver.resolve(url)
+                if self._episode is None:
+                    metadata = self.metadata_extractor.extract_all_metadata(url)
+                    self._episode = self.feed_resolver.resolve(
+                        url, metadata["podcast_title"], metadata["episode_title"]
+                    )
+            
+            if self._episode is not None:
+                return TranscriptMetadata(
+                    title=self.metadata_extractor.clean_title(self._episode.title),
+                    source_name=self._episode.podcast_title or (metadata or {}).get("podcast_title", "untitled_podcast"),
+                    description=self._episode.description or (metadata or {}).get("episode_description", "no_description_found"),
+                    url=url,
+                    source_type=self.source_type
+                )
+            
+            metadata = metadata or self.metadata_extractor.extract_all_metadata(url)
             
             return TranscriptMetadata(
-                title=metadata["episode_title"],
+                title=self.metadata_extractor.clean_title(metadata["episode_title"]),
                 source_name=metadata["podcast_title"],
                 description=metadata["episode_description"],
                 url=url,
@@ -48,38 +92,103 @@ class PodcastSource(TranscriptSource):
         except Exception as e:
             raise RuntimeError(f"Failed to extract podcast metadata: {e}")
     
-    def extract_transcript(self, url: str) -> TranscriptResult:
+    def extract_transcript(self, url: str, decode_profile: Optional[str] = None) -> TranscriptResult:
         """Extract transcript from podcast episode."""
         try:
-            # Extract metadata first
-            metadata = self.extract_metadata(url)
-            
-            # Download audio
-            self._audio_path = self.audio_downloader.download_audio(url, metadata.title)
-            if not self._audio_path:
-                raise RuntimeError("Failed to download podcast audio")
+            metadata, audio_input = self._prepare_audio(url)
             
             # Transcribe audio
-            transcription_result = self.transcriber.transcribe_audio(self._audio_path)
+            transcription_result = self.transcriber.transcribe_audio(audio_input, decode_profile)
             if not transcription_result:
                 raise RuntimeError("Failed to transcribe podcast audio")
             
+            if Config.STREAMING_DECODE:
+                # A blocking call yields no segments early; stream_transcript times first_segment
+                self.last_stream_timings.mark("transcription_done")
+                print(f"Streaming timings: {self.last_stream_timings.summary()}")
+            
             raw_text = self.transcriber.get_transcript_text(transcription_result)
             
             return TranscriptResult(
                 raw_text=raw_text,
-                metadata=metadata
+                metadata=metadata,
+                segments=self.transcriber.get_segment_store(transcription_result),
+                decode_profile=transcription_result.get("decode_profile")
             )
             
         except Exception as e:
+            # Don't leave the downloaded audio behind when the job fails
+            self.cleanup()
             raise RuntimeError(f"Failed to extract podcast transcript: {e}")
     
+    def stream_transcript(self, url: str, decode_profile: Optional[str] = None) -> TranscriptStream:
+        """Extract metadata and audio, then transcribe lazily as the segments are consumed."""
+        self.last_stream_timings = StreamTimings()
+        profile = get_decode_profile(decode_profile)
+        try:
+            metadata, audio_input = self._prepare_audio(url)
+        except Exception as e:
+            self.cleanup()
+            raise RuntimeError(f"Failed to extract podcast transcript: {e}")
+        
+        return TranscriptStream(metadata, self._iter_segments(audio_input, profile.name), profile.label)
+    
+    def _iter_segments(self, audio_input: Union[str, np.ndarray], decode_profile: str) -> Iterator[Dict]:
+        try:
+            for segment in self.transcriber.iter_segments(audio_input, decode_profile):
+                self.last_stream_timings.mark("first_segment")
+                yield segment
+        except Exception as e:
+            self.cleanup()
+            raise RuntimeError(f"Failed to transcribe podcast audio: {e}")
+    
+    def _prepare_audio(self, url: str) -> Tuple[TranscriptMetadata, Union[str, np.ndarray]]:
+        """Extract metadata and fetch the episode audio as a file path or decoded PCM."""
+        # Extract metadata first
+        metadata = self.extract_metadata(url)
+        
+        # Find audio, straight from the feed enclosure when we have one
+        if self._episode is not None:
+            audio_url = self._episode.enclosure_url
+        else:
+            audio_url = self.audio_downloader.find_audio_url(url, metadata.title)
+        if not audio_url:
+            raise RuntimeError("Failed to download podcast audio")
+        
+        if Config.STREAMING_DECODE:
+            # Decode while downloading; the PCM is ready when the last byte arrives
+            decoded = self.audio_downloader.stream_audio(
+                audio_url, metadata.title, save_to_disk=Config.STREAMING_SAVE_AUDIO
+            )
+            if decoded is None:
+                raise RuntimeError("Failed to download podcast audio")
+            self._audio_path = decoded.path
+            audio_input = decoded.audio
+            pcm_cache = self.transcriber.pcm_cache
+            if pcm_cache and decoded.path:
+                # Keep the PCM for retries and re-transcription, and memory-map it from here on
+                audio_input = pcm_cache.put(pcm_cache.key(decoded.path), decoded.audio)
+            self.last_stream_timings = decoded.timings
+        else:
+            self._audio_path = self.audio_downloader.download_file(audio_url, metadata.title)
+            if not self._audio_path:
+                raise RuntimeError("Failed to download podcast audio")
+            audio_input = self._audio_path
+        
+        return metadata, audio_input
+    
+    def _is_direct_audio(self, url: str) -> bool:
+        """Whether a URL is an audio file rather than an episode page."""
+        if 'podcasts.apple.com' in url or 'spotify.com' in url:
+            return False
+        return url.endswith('.mp3') or self.audio_downloader.is_audio_url(url)
+    
     def get_source_type(self) -> str:
         """Get the source type identifier."""
         return self.source_type
     
     def cleanup(self) -> None:
         """Clean up temporary files."""
-        if self._audio_path and os.path.exists(self._audio_path):
+        if self._audio_path:
             self.audio_downloader.cleanup_file(self._audio_path)
             self._audio_path = None
@@ -0,0 +1,250 @@
+"""Parallel, resumable HTTP Range downloads."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import requests
+
+from .config import Config
+from .http_client import HttpClient, get_http_client
+
+
+@dataclass
+class DownloadStats:
+    """Outcome of a download, for logging and throughput reporting."""
+    url: str
+    path: str
+    total_bytes: int
+    downloaded_bytes: int  # Bytes transferred in this run
+    resumed_bytes: int  # Bytes reused from an earlier partial download
+    seconds: float
+    connections: int
+    ranged: bool
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Transfer rate of this run in MB/s."""
+        return self.downloaded_bytes / (1024 * 1024) / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ResourceProbe:
+    """What a server told us about a resource before downloading it."""
+    url: str  # Final URL after redirects
+    total_bytes: Optional[int]
+    accepts_ranges: bool
+    etag: Optional[str]
+    content_type: str
+
+
+class RangeDownloader:
+    """Downloads large files over several ranged connections with resume support."""
+
+    def __init__(self, http_client: Optional[HttpClient] = None, max_connections: int = None,
+                 segment_size: int = None, buffer_size: int = None):
+        """
+        Initialize the downloader.
+
+        Args:
+            http_client: Client used for all requests
+            max_connections: Parallel connections per download
+            segment_size: Bytes fetched per Range request
+            buffer_size: Bytes read from the socket per write
+        """
+        self.http_client = http_client or get_http_client()
+        self.max_connections = max_connections or Config.DOWNLOAD_CONNECTIONS
+        self.segment_size = segment_size or Config.DOWNLOAD_SEGMENT_SIZE
+        self.buffer_size = buffer_size or Config.DOWNLOAD_BUFFER_SIZE
+
+    def download(self, url: str, dest_path: str, probe: Optional[ResourceProbe] = None) -> DownloadStats:
+        """
+        Download a URL to dest_path.
+
+        Servers that accept ranges are fetched in parallel segments into a
+        .part file, with finished segments recorded in a .progress.json
+        sidecar so an interrupted download resumes where it stopped. Other
+        servers are streamed over one connection.
+
+        Args:
+            url: File URL
+            dest_path: Final file path
+            probe: Result of an earlier probe() of the URL, to skip probing again
+
+        Returns:
+            DownloadStats for the transfer
+
+        Raises:
+            requests.RequestException: On network failure
+            IOError: If the final size does not match Content-Length
+        """
+        probe = probe or self.probe(url)
+        start = time.perf_counter()
+
+        if probe.accepts_ranges and probe.total_bytes:
+            downloaded, resumed, connections = self._download_ranged(probe, dest_path)
+        else:
+            downloaded, resumed, connections = self._download_single(probe, dest_path), 0, 1
+
+        stats = DownloadStats(
+            url=probe.url,
+            path=dest_path,
+            total_bytes=os.path.getsize(dest_path),
+            downloaded_bytes=downloaded,
+            resumed_bytes=resumed,
+            seconds=time.perf_counter() - start,
+            connections=connections,
+            ranged=probe.accepts_ranges and bool(probe.total_bytes)
+        )
+        print(f"Downloaded {stats.total_bytes / (1024 * 1024):.1f} MB in {stats.seconds:.1f}s "
+              f"({stats.throughput_mb_s:.2f} MB/s over {connections} connection(s)"
+              f"{f', {resumed / (1024 * 1024):.1f} MB resumed' if resumed else ''})")
+        return stats
+
+    def probe(self, url: str) -> ResourceProbe:
+        """Find the final URL, size and range support of a resource."""
+        response = self.http_client.head(url)
+        if response.ok:
+            total = _int_header(response.headers.get("Content-Length"))
+            if response.headers.get("Accept-Ranges", "").lower() == "bytes" and total:
+                return ResourceProbe(response.url, total, True, response.headers.get("ETag"),
+                              response.headers.get("Content-Type", ""))
+
+        # Many CDNs omit Accept-Ranges on HEAD (or reject HEAD); ask for one byte instead
+        with self.http_client.get(url, headers={"Range": "bytes=0-0"}, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            etag = response.headers.get("ETag")
+            if response.status_code == 206:
+                total = _int_header(response.headers.get("Content-Range", "").rpartition("/")[2])
+                return ResourceProbe(response.url, total, bool(total), etag, content_type)
+            return ResourceProbe(response.url, _int_header(response.headers.get("Content-Length")),
+                          False, etag, content_type)
+
+    def _download_ranged(self, probe: ResourceProbe, dest_path: str) -> Tuple[int, int, int]:
+        part_path = f"{dest_path}.part"
+        progress_path = f"{dest_path}.progress.json"
+        segments = self._segments(probe.total_bytes)
+
+        progress = self._load_progress(progress_path)
+        resumable = (
+            progress
+            and progress.get("url") == probe.url
+            and progress.get("total_bytes") == probe.total_bytes
+            and progress.get("etag") == probe.etag
+            and progress.get("segment_size") == self.segment_size
+            and os.path.exists(part_path)
+            and os.path.getsize(part_path) == probe.total_bytes
+        )
+        completed = set(progress["completed"]) if resumable else set()
+        if not resumable:
+            with open(part_path, "wb") as f:
+                f.truncate(probe.total_bytes)
+
+        pending = [i for i in range(len(segments)) if i not in completed]
+        resumed = sum(segments[i][1] - segments[i][0] + 1 for i in completed)
+        lock = threading.Lock()
+
+        def fetch(index: int) -> int:
+            written = self._fetch_segment(probe.url, part_path, *segments[index])
+            with lock:
+                completed.add(index)
+                self._save_progress(progress_path, {
+                    "url": probe.url,
+                    "total_bytes": probe.total_bytes,
+                    "etag": probe.etag,
+                    "segment_size": self.segment_size,
+                    "completed": sorted(completed)
+                })
+            return written
+
+        connections = max(1, min(self.max_connections, len(pending)))
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            downloaded = sum(executor.map(fetch, pending))
+
+        self._verify_size(part_path, probe.total_bytes)
+        os.replace(part_path, dest_path)
+        _remove(progress_path)
+        return downloaded, resumed, connections
+
+    def _fetch_segment(self, url: str, part_path: str, start: int, end: int) -> int:
+        """Fetch one byte range into its place in the part file, retrying dropped connections."""
+        expected = end - start + 1
+        attempt = 0
+        while True:
+            try:
+                with self.http_client.get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise IOError(f"Server ignored range request ({response.status_code})")
+                    written = 0
+                    with open(part_path, "r+b") as f:
+                        f.seek(start)
+                        for chunk in response.iter_content(chunk_size=self.buffer_size):
+                            f.write(chunk)
+                            written += len(chunk)
+                if written != expected:
+                    raise IOError(f"Segment {start}-{end} short by {expected - written} bytes")
+                return written
+            except (requests.RequestException, IOError):
+                if attempt >= self.http_client.max_retries:
+                    raise
+                attempt += 1
+                time.sleep(self.http_client.backoff_delay(attempt))
+
+    def _download_single(self, probe: ResourceProbe, dest_path: str) -> int:
+        """Stream the whole body over one connection with large buffered writes."""
+        part_path = f"{dest_path}.part"
+        written = 0
+        with self.http_client.get(probe.url, stream=True) as response:
+            response.raise_for_status()
+            with open(part_path, "wb", buffering=self.buffer_size) as f:
+                for chunk in response.iter_content(chunk_size=self.buffer_size):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if probe.total_bytes:
+            self._verify_size(part_path, probe.total_bytes)
+        os.replace(part_path, dest_path)
+        return written
+
+    def _segments(self, total_bytes: int) -> List[Tuple[int, int]]:
+        return [
+            (start, min(start + self.segment_size, total_bytes) - 1)
+            for start in range(0, total_bytes, self.segment_size)
+        ]
+
+    def _verify_size(self, path: str, expected: int) -> None:
+        actual = os.path.getsize(path)
+        if actual != expected:
+            raise IOError(f"Downloaded size {actual} does not match Content-Length {expected}")
+
+    def _load_progress(self, progress_path: str) -> Optional[Dict]:
+        try:
+            with open(progress_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_progress(self, progress_path: str, progress: Dict) -> None:
+        tmp_path = f"{progress_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(progress, f)
+        os.replace(tmp_path, progress_path)
+
+
+def _int_header(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,163 @@
+"""Second-pass re-transcription of low-confidence segments with a larger model."""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import Config
+from .decode_profiles import DecodeProfile
+from .model_registry import ModelRegistry
+from .segment_store import SegmentStore
+from .stream_decoder import SAMPLE_RATE
+from .transcription_engines import TranscriptionEngine, create_engine, shift_segment
+
+# Audio kept either side of a span (within the neighbouring gaps) so words at its edges aren't clipped
+PAD_SECONDS = 1.0
+
+
+@dataclass
+class RefinementReport:
+    """What the second pass re-decoded and replaced."""
+    model: str
+    spans: int = 0
+    redecoded_seconds: float = 0.0
+    audio_seconds: float = 0.0
+    replaced_segments: int = 0
+    kept_spans: int = 0  # Spans where the first pass scored better and was kept
+    seconds: float = 0.0
+
+    @property
+    def redecoded_fraction(self) -> float:
+        return self.redecoded_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"re-decoded {self.redecoded_seconds:.0f}s of {self.audio_seconds:.0f}s "
+                f"({self.redecoded_fraction:.1%}) in {self.spans} spans with {self.model}, "
+                f"replaced {self.replaced_segments} segments, took {self.seconds:.1f}s")
+
+
+class SegmentRefiner:
+    """Re-transcribes only the segments a fast model was unsure about.
+
+    Segments are flagged by Whisper's own confidence signals: low average
+    token log probability, a high compression ratio (repetition loops) or
+    text where the model thought there was no speech. Nearby flagged
+    segments are merged into spans, each span is re-decoded with the larger
+    model, and its segments are spliced in if they score better.
+    """
+
+    def __init__(self, model_name: str = None, model_registry: Optional[ModelRegistry] = None,
+                 engine: Optional[TranscriptionEngine] = None):
+        """
+        Initialize the refiner.
+
+        Args:
+            model_name: Larger Whisper model for the second pass (Config.REFINE_MODEL by default)
+            model_registry: Registry the model is loaded from (the shared one by default)
+            engine: Second-pass engine (created from model_name on first use by default)
+        """
+        self.model_name = model_name or Config.REFINE_MODEL
+        self.model_registry = model_registry
+        self._engine = engine
+
+    @property
+    def engine(self) -> TranscriptionEngine:
+        if self._engine is None:
+            self._engine = create_engine(model_name=self.model_name, model_registry=self.model_registry)
+        return self._engine
+
+    def flag_segments(self, segments: SegmentStore) -> np.ndarray:
+        """Boolean mask of segments worth re-transcribing."""
+        has_text = np.diff(segments.offsets) > 0
+        return (
+            (segments.avg_logprobs < Config.REFINE_LOGPROB_THRESHOLD)
+            | (segments.compression_ratios > Config.REFINE_COMPRESSION_THRESHOLD)
+            | ((segments.no_speech_probs > Config.REFINE_NO_SPEECH_THRESHOLD) & has_text)
+        )
+
+    def find_spans(self, segments: SegmentStore) -> List[Tuple[int, int]]:
+        """
+        Group flagged segments into spans to re-decode.
+
+        Flagged segments less than Config.REFINE_MERGE_GAP_SECONDS apart share
+        a span, along with any segments between them.
+
+        Returns:
+            (first, last) segment index pairs, last exclusive
+        """
+        spans: List[Tuple[int, int]] = []
+        for index in np.flatnonzero(self.flag_segments(segments)):
+            index = int(index)
+            if spans and segments.starts[index] - segments.ends[spans[-1][1] - 1] <= Config.REFINE_MERGE_GAP_SECONDS:
+                spans[-1] = (spans[-1][0], index + 1)
+            else:
+                spans.append((index, index + 1))
+        return spans
+
+    def refine(self, audio: np.ndarray, result: Dict, profile: Optional[DecodeProfile] = None) -> Dict:
+        """
+        Re-transcribe a result's low-confidence spans and splice them in.
+
+        Args:
+            audio: The 16 kHz mono PCM the result was transcribed from
+            result: Whisper-format result from the first pass
+            profile: Decode profile for the second pass (backend defaults if None)
+
+        Returns:
+            Whisper-format result with refined segments, plus a "refinement" report
+        """
+        start = time.perf_counter()
+        original = result.get("segments", [])
+        store = SegmentStore.from_segments(original)
+        audio_seconds = len(audio) / SAMPLE_RATE
+        report = RefinementReport(self.model_name, audio_seconds=audio_seconds)
+        options = self.engine.decode_options(profile) if profile else {}
+
+        segments: List[Dict] = []
+        copied = 0
+        for first, last in self.find_spans(store):
+            # Extend into the gaps around the span, but never into neighbouring speech
+            previous_end = float(store.ends[first - 1]) if first > 0 else 0.0
+            next_start = float(store.starts[last]) if last < len(store) else audio_seconds
+            span_start = max(previous_end, float(store.starts[first]) - PAD_SECONDS)
+            span_end = min(next_start, float(store.ends[last - 1]) + PAD_SECONDS)
+
+            span_audio = audio[int(span_start * SAMPLE_RATE):int(span_end * SAMPLE_RATE)]
+            refined = self.engine.transcribe(span_audio, **options).get("segments", [])
+            report.spans += 1
+            report.redecoded_seconds += span_end - span_start
+
+            segments.extend(original[copied:first])
+            if self._is_better(refined, store, first, last):
+                segments.extend(shift_segment(segment, span_start, 0) for segment in refined)
+                report.replaced_segments += last - first
+            else:
+                segments.extend(original[first:last])
+                report.kept_spans += 1
+            copied = last
+        segments.extend(original[copied:])
+
+        segments = [dict(segment, id=index) for index, segment in enumerate(segments)]
+        report.seconds = time.perf_counter() - start
+        print(f"Refinement: {report.summary()}")
+
+        return dict(
+            result,
+            text="".join(segment["text"] for segment in segments),
+            segments=segments,
+            refinement=asdict(report)
+        )
+
+    def _is_better(self, refined: List[Dict], store: SegmentStore, first: int, last: int) -> bool:
+        """Whether the second pass beats the first over a span, by duration-weighted log probability."""
+        if not refined:
+            # Nothing heard: better only if the first pass was text over silence
+            return bool(np.all(store.no_speech_probs[first:last] > Config.REFINE_NO_SPEECH_THRESHOLD))
+
+        durations = np.maximum(store.ends[first:last] - store.starts[first:last], 1e-3)
+        before = float(np.average(store.avg_logprobs[first:last], weights=durations))
+        refined_durations = [max(segment["end"] - segment["start"], 1e-3) for segment in refined]
+        after = float(np.average([segment.get("avg_logprob", 0.0) for segment in refined], weights=refined_durations))
+        return after >= before
@@ -0,0 +1,155 @@
+"""Compact, array-backed storage of transcription segments."""
+
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class SegmentStore:
+    """Transcript segments as parallel NumPy arrays plus one UTF-8 text buffer.
+
+    Segment i spans ``starts[i]``-``ends[i]`` seconds and its text is
+    ``text_buffer[offsets[i]:offsets[i + 1]]``. Compared with a list of
+    Whisper's segment dicts this takes a few dozen bytes per segment, slices
+    by time with a binary search, and saves as a single .npz file.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, avg_logprobs: np.ndarray,
+                 no_speech_probs: np.ndarray, compression_ratios: np.ndarray,
+                 text_buffer: bytes, offsets: np.ndarray):
+        """
+        Wrap existing arrays; use from_segments() or load() to build a store.
+
+        Args:
+            starts: Segment start times in seconds (float32, ascending)
+            ends: Segment end times in seconds (float32)
+            avg_logprobs: Mean token log probability per segment (float32)
+            no_speech_probs: Probability that the segment is silence (float32)
+            compression_ratios: gzip compression ratio of the text; high means repetitive (float32)
+            text_buffer: Every segment's text, UTF-8 encoded and concatenated
+            offsets: Byte offsets of each segment's text, one more than segments (int64)
+        """
+        self.starts = starts
+        self.ends = ends
+        self.avg_logprobs = avg_logprobs
+        self.no_speech_probs = no_speech_probs
+        self.compression_ratios = compression_ratios
+        self.text_buffer = text_buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict]) -> "SegmentStore":
+        """Build a store from Whisper-style segment dicts."""
+        starts, ends, avg_logprobs, no_speech_probs, compression_ratios = [], [], [], [], []
+        encoded = []
+        offsets = [0]
+        for segment in segments:
+            starts.append(segment.get("start", 0.0))
+            ends.append(segment.get("end", 0.0))
+            avg_logprobs.append(segment.get("avg_logprob", 0.0))
+            no_speech_probs.append(segment.get("no_speech_prob", 0.0))
+            compression_ratios.append(segment.get("compression_ratio", 0.0))
+            text = segment.get("text", "").encode("utf-8")
+            encoded.append(text)
+            offsets.append(offsets[-1] + len(text))
+
+        return cls(
+            np.asarray(starts, dtype=np.float32),
+            np.asarray(ends, dtype=np.float32),
+            np.asarray(avg_logprobs, dtype=np.float32),
+            np.asarray(no_speech_probs, dtype=np.float32),
+            np.asarray(compression_ratios, dtype=np.float32),
+            b"".join(encoded),
+            np.asarray(offsets, dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SegmentStore":
+        """Load a store written by save()."""
+        with np.load(path) as data:
+            return cls(
+                data["starts"], data["ends"], data["avg_logprobs"], data["no_speech_probs"],
+                data["compression_ratios"], data["text"].tobytes(), data["offsets"]
+            )
+
+    def save(self, path: str) -> None:
+        """Write the store to an uncompressed .npz file (fast to write and load)."""
+        np.savez(
+            path,
+            starts=self.starts,
+            ends=self.ends,
+            avg_logprobs=self.avg_logprobs,
+            no_speech_probs=self.no_speech_probs,
+            compression_ratios=self.compression_ratios,
+            text=np.frombuffer(self.text_buffer, dtype=np.uint8),
+            offsets=self.offsets
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self)):
+            yield self.segment(index)
+
+    @property
+    def text(self) -> str:
+        """Full transcript text, as Whisper's result['text'] would have it."""
+        return self.text_buffer.decode("utf-8")
+
+    @property
+    def duration(self) -> float:
+        """End time of the last segment in seconds."""
+        return float(self.ends[-1]) if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays and text buffer."""
+        arrays = (self.starts, self.ends, self.avg_logprobs, self.no_speech_probs,
+                  self.compression_ratios, self.offsets)
+        return sum(array.nbytes for array in arrays) + len(self.text_buffer)
+
+    def segment_text(self, index: int) -> str:
+        return self.text_buffer[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def segment(self, index: int) -> Dict:
+        """One segment as a Whisper-style dict."""
+        return {
+            "id": index,
+            "start": float(self.starts[index]),
+            "end": float(self.ends[index]),
+            "text": self.segment_text(index),
+            "avg_logprob": float(self.avg_logprobs[index]),
+            "no_speech_prob": float(self.no_speech_probs[index]),
+            "compression_ratio": float(self.compression_ratios[index])
+        }
+
+    def slice_time(self, start: float, end: Optional[float] = None) -> "SegmentStore":
+        """
+        Segments overlapping the time range [start, end).
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds (None for the end of the episode)
+
+        Returns:
+            A store whose time and probability arrays are views into this one
+        """
+        first = int(np.searchsorted(self.ends, start, side="right"))
+        last = len(self) if end is None else int(np.searchsorted(self.starts, end, side="left"))
+        last = max(first, last)
+        return self.slice(first, last)
+
+    def slice(self, first: int, last: int) -> "SegmentStore":
+        """Segments first..last-1, sharing this store's time and probability arrays."""
+        offsets = self.offsets[first:last + 1]
+        base = int(offsets[0]) if len(offsets) else 0
+        return SegmentStore(
+            self.starts[first:last],
+            self.ends[first:last],
+            self.avg_logprobs[first:last],
+            self.no_speech_probs[first:last],
+            self.compression_ratios[first:last],
+            self.text_buffer[base:int(offsets[-1])] if len(offsets) else b"",
+            offsets - base if len(offsets) else np.zeros(1, dtype=np.int64)
+        )
@@ -0,0 +1,258 @@
+"""Disk budget and orphan sweeping for downloaded audio."""
+
+import os
+import shutil
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from .config import Config
+
+
+# Files left behind by interrupted downloads
+PARTIAL_SUFFIXES = (".part", ".progress.json", ".tmp")
+
+# Marks a file as in use for every process sharing the folder; holds "<hostname> <pid>"
+LEASE_SUFFIX = ".lease"
+
+
+class StorageManager:
+    """Keeps the downloads folder (and optional scratch folder) within a byte budget.
+
+    Files registered as active belong to a running job and are never removed.
+    Registering also writes a lease file next to the file, so storage managers
+    of other worker processes sharing the folder leave it alone too, until the
+    owning process exits. Everything else is fair game: partial downloads and
+    files older than the orphan age are swept, and the least recently used
+    files are evicted when usage exceeds the budget.
+    """
+
+    def __init__(self, download_folder: str = None, max_bytes: int = None,
+                 orphan_age_seconds: float = None, scratch_folder: Optional[str] = None):
+        """
+        Initialize the storage manager.
+
+        Args:
+            download_folder: Persistent downloads folder
+            max_bytes: Byte budget across the managed folders
+            orphan_age_seconds: Unregistered files older than this are swept
+            scratch_folder: Fast staging folder (e.g. on tmpfs) to download into
+        """
+        self.download_folder = download_folder or Config.DOWNLOAD_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else Config.DOWNLOAD_MAX_BYTES
+        self.orphan_age_seconds = orphan_age_seconds if orphan_age_seconds is not None else Config.DOWNLOAD_ORPHAN_AGE
+        self.scratch_folder = scratch_folder if scratch_folder is not None else Config.SCRATCH_FOLDER
+        self._active: Set[str] = set()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = {"swept_files": 0, "swept_bytes": 0, "evicted_files": 0, "evicted_bytes": 0}
+
+        os.makedirs(self.download_folder, exist_ok=True)
+        if self.scratch_folder:
+            try:
+                os.makedirs(self.scratch_folder, exist_ok=True)
+            except OSError as e:
+                print(f"Scratch folder unavailable, using {self.download_folder}: {e}")
+                self.scratch_folder = None
+
+    @property
+    def working_folder(self) -> str:
+        """Folder new downloads should be staged in."""
+        return self.scratch_folder or self.download_folder
+
+    @property
+    def folders(self) -> List[str]:
+        return [folder for folder in (self.download_folder, self.scratch_folder) if folder]
+
+    def register(self, path: str) -> None:
+        """Mark a file as in use by a running job, in this and every other process."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._active.add(path)
+        try:
+            with open(path + LEASE_SUFFIX, "w", encoding="utf-8") as f:
+                f.write(f"{socket.gethostname()} {os.getpid()}")
+        except OSError as e:
+            print(f"Error writing lease for {path}: {e}")
+
+    def unregister(self, path: str) -> None:
+        """Release a file registered with register()."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._active.discard(path)
+        self._remove(path + LEASE_SUFFIX)
+
+    def usage(self) -> Dict[str, int]:
+        """Disk usage metrics for the managed folders."""
+        files = self._list_files()
+        usage = {
+            "files": len(files),
+            "bytes": sum(size for _, size, _ in files),
+            "partial_files": sum(1 for path, _, _ in files if path.endswith(PARTIAL_SUFFIXES)),
+            "active_files": len(self._active),
+            "max_bytes": self.max_bytes
+        }
+        try:
+            disk = shutil.disk_usage(self.download_folder)
+            usage["disk_free_bytes"] = disk.free
+            usage["disk_total_bytes"] = disk.total
+        except OSError:
+            pass
+        with self._lock:
+            usage.update(self._stats)
+        return usage
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Remove orphaned and stale partial files, then enforce the byte budget.
+
+        Returns:
+            Current usage metrics after the sweep
+        """
+        now = time.time()
+        leased = self._leased_paths()
+        for path, size, mtime in self._list_files():
+            if self._is_active(path, leased) or now - mtime < self.orphan_age_seconds:
+                continue
+            if self._remove(path):
+                self._record("swept", size)
+                print(f"Swept orphaned download: {path}")
+
+        self.make_room(0)
+        return self.usage()
+
+    def make_room(self, needed_bytes: int) -> None:
+        """Evict least recently used inactive files until needed_bytes fit in the budget."""
+        files = sorted(self._list_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        leased = None
+
+        for path, size, _ in files:
+            if total + needed_bytes <= self.max_bytes:
+                break
+            if leased is None:
+                leased = self._leased_paths()
+            if self._is_active(path, leased):
+                continue
+            if self._remove(path):
+                total -= size
+                self._record("evicted", size)
+                print(f"Evicted download to stay within budget: {path}")
+
+    def start_periodic_sweep(self, interval_seconds: float = None) -> None:
+        """Sweep now and then every interval in a background thread."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        interval = interval_seconds or Config.DOWNLOAD_SWEEP_INTERVAL
+        self._stop_event.clear()
+
+        def run():
+            while True:
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"Error sweeping downloads: {e}")
+                if self._stop_event.wait(interval):
+                    return
+
+        self._sweeper = threading.Thread(target=run, name="download-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self) -> None:
+        """Stop the periodic sweep."""
+        self._stop_event.set()
+
+    def _list_files(self):
+        """(path, size, last access or modification time) for every managed file."""
+        files = []
+        for folder in self.folders:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith(LEASE_SUFFIX):
+                    continue
+                path = os.path.abspath(os.path.join(folder, name))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path):
+                    files.append((path, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+        return files
+
+    def _is_active(self, path: str, leased: Set[str]) -> bool:
+        with self._lock:
+            active = self._active | leased
+        # Partial files of an active download are protected too
+        return any(path.startswith(active_path) for active_path in active)
+
+    def _leased_paths(self) -> Set[str]:
+        """Files with a live lease from any process; leases left by dead processes are removed."""
+        leased = set()
+        hostname = socket.gethostname()
+        now = time.time()
+        for folder in self.folders:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith(LEASE_SUFFIX):
+                    continue
+                lease_path = os.path.abspath(os.path.join(folder, name))
+                try:
+                    with open(lease_path, "r", encoding="utf-8") as f:
+                        owner_host, _, owner_pid = f.read().strip().rpartition(" ")
+                    age = now - os.stat(lease_path).st_mtime
+                except OSError:
+                    continue
+                if owner_host == hostname and owner_pid.isdigit() and os.name == "posix":
+                    alive = _process_alive(int(owner_pid))
+                else:
+                    # Can't see the owner from here; trust the lease until it's orphan-aged
+                    alive = age < self.orphan_age_seconds
+                if alive:
+                    leased.add(lease_path[:-len(LEASE_SUFFIX)])
+                else:
+                    self._remove(lease_path)
+        return leased
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _record(self, kind: str, size: int) -> None:
+        with self._lock:
+            self._stats[f"{kind}_files"] += 1
+            self._stats[f"{kind}_bytes"] += size
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a local process exists (POSIX only: on Windows os.kill terminates it)."""
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+_shared_manager: Optional[StorageManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_storage_manager() -> StorageManager:
+    """Get the process-wide storage manager for downloads."""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = StorageManager()
+        return _shared_manager
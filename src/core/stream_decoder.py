@@ -0,0 +1,153 @@
+"""Decode audio to 16 kHz PCM while it downloads."""
+
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .config import Config
+from .http_client import HttpClient, get_http_client
+
+
+# Whisper's expected input format
+SAMPLE_RATE = 16000
+
+FFMPEG_DECODE_ARGS = [
+    "-nostdin", "-threads", "0", "-i", "pipe:0",
+    "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "pipe:1"
+]
+
+
+@dataclass
+class StreamTimings:
+    """Milestones of a streamed job, in seconds since it started."""
+    started_at: float = field(default_factory=time.perf_counter)
+    marks: Dict[str, float] = field(default_factory=dict)
+    bytes_in: int = 0
+
+    def mark(self, name: str) -> None:
+        """Record a milestone the first time it is reached."""
+        self.marks.setdefault(name, time.perf_counter() - self.started_at)
+
+    def summary(self) -> str:
+        parts = [f"{name} {seconds:.1f}s" for name, seconds in sorted(self.marks.items(), key=lambda item: item[1])]
+        return ", ".join(parts)
+
+
+@dataclass
+class DecodedAudio:
+    """PCM produced by a streamed decode, plus where the source audio was kept (if anywhere)."""
+    audio: np.ndarray
+    path: Optional[str]
+    timings: StreamTimings
+
+
+class StreamingDecoder:
+    """Pipes an HTTP body (or a local file) into ffmpeg and collects 16 kHz mono PCM."""
+
+    def __init__(self, http_client: Optional[HttpClient] = None, chunk_size: int = None,
+                 ffmpeg_path: str = "ffmpeg"):
+        self.http_client = http_client or get_http_client()
+        self.chunk_size = chunk_size or Config.DOWNLOAD_BUFFER_SIZE
+        self.ffmpeg_path = ffmpeg_path
+
+    def decode_url(self, url: str, save_path: Optional[str] = None,
+                   timings: Optional[StreamTimings] = None) -> DecodedAudio:
+        """
+        Download a URL and decode it at the same time.
+
+        Args:
+            url: Audio URL
+            save_path: Also write the raw download here; None keeps nothing on disk
+            timings: Timings to record milestones into
+
+        Returns:
+            DecodedAudio with float32 samples in [-1, 1]
+
+        Raises:
+            RuntimeError: If ffmpeg fails to decode the stream
+        """
+        timings = timings or StreamTimings()
+        part_path = f"{save_path}.part" if save_path else None
+
+        with self.http_client.get(url, stream=True) as response:
+            response.raise_for_status()
+            sink = open(part_path, "wb") if part_path else None
+            try:
+                audio = self._decode(response.iter_content(chunk_size=self.chunk_size), timings, sink)
+            except Exception:
+                if sink:
+                    sink.close()
+                    os.remove(part_path)
+                raise
+            if sink:
+                sink.close()
+
+        if part_path:
+            os.replace(part_path, save_path)
+        return DecodedAudio(audio, save_path, timings)
+
+    def decode_file(self, path: str, timings: Optional[StreamTimings] = None) -> DecodedAudio:
+        """Decode a local audio file through the same pipeline."""
+        timings = timings or StreamTimings()
+
+        def read_blocks():
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(self.chunk_size), b""):
+                    yield block
+
+        return DecodedAudio(self._decode(read_blocks(), timings), path, timings)
+
+    def _decode(self, chunks, timings: StreamTimings, sink=None) -> np.ndarray:
+        """Feed byte chunks to ffmpeg's stdin while a thread drains PCM from its stdout."""
+        process = subprocess.Popen(
+            [self.ffmpeg_path] + FFMPEG_DECODE_ARGS,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        pcm = bytearray()
+        stderr: List[bytes] = []
+
+        def drain_stdout():
+            for block in iter(lambda: process.stdout.read(64 * 1024), b""):
+                timings.mark("first_pcm")
+                pcm.extend(block)
+
+        def drain_stderr():
+            stderr.append(process.stderr.read())
+
+        readers = [threading.Thread(target=drain_stdout, daemon=True),
+                   threading.Thread(target=drain_stderr, daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        try:
+            for chunk in chunks:
+                timings.mark("first_byte")
+                timings.bytes_in += len(chunk)
+                if sink:
+                    sink.write(chunk)
+                process.stdin.write(chunk)
+            timings.mark("download_done")
+        except BrokenPipeError:
+            pass
+        except Exception:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        for reader in readers:
+            reader.join()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to decode audio: {b''.join(stderr).decode(errors='replace')[-500:]}")
+        timings.mark("pcm_ready")
+
+        return np.frombuffer(bytes(pcm), np.int16).flatten().astype(np.float32) / 32768.0
@@ -0,0 +1,107 @@
+"""Tempo compression: speed audio up before transcription, then map timestamps back."""
+
+import subprocess
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from .stream_decoder import SAMPLE_RATE
+
+# atempo's range per filter instance in older ffmpeg builds; larger factors are chained
+ATEMPO_MAX = 2.0
+ATEMPO_MIN = 0.5
+
+# Samples written to ffmpeg per chunk
+CHUNK_SAMPLES = 10 * SAMPLE_RATE
+
+
+def atempo_filter(tempo: float) -> str:
+    """ffmpeg filter graph for a tempo factor, chaining atempo instances past its range."""
+    if tempo <= 0:
+        raise ValueError(f"Tempo must be positive: {tempo}")
+    factors = []
+    while tempo > ATEMPO_MAX:
+        factors.append(ATEMPO_MAX)
+        tempo /= ATEMPO_MAX
+    while tempo < ATEMPO_MIN:
+        factors.append(ATEMPO_MIN)
+        tempo /= ATEMPO_MIN
+    factors.append(tempo)
+    return ",".join(f"atempo={factor:.6g}" for factor in factors)
+
+
+def time_stretch(audio: np.ndarray, tempo: float, ffmpeg_path: str = "ffmpeg") -> np.ndarray:
+    """
+    Change the speed of 16 kHz mono PCM without changing its pitch.
+
+    Uses ffmpeg's atempo (WSOLA), which keeps voices natural up to about 2x.
+
+    Args:
+        audio: Float32 samples in [-1, 1]
+        tempo: Speed factor; 1.5 plays 1.5x as fast, so the result is 2/3 as long
+        ffmpeg_path: ffmpeg executable
+
+    Returns:
+        Time-stretched float32 samples
+    """
+    if tempo == 1.0:
+        return audio
+
+    process = subprocess.Popen(
+        [ffmpeg_path, "-nostdin", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-i", "pipe:0",
+         "-filter:a", atempo_filter(tempo), "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    pcm = bytearray()
+    stderr: List[bytes] = []
+
+    def drain_stdout():
+        for block in iter(lambda: process.stdout.read(64 * 1024), b""):
+            pcm.extend(block)
+
+    def drain_stderr():
+        stderr.append(process.stderr.read())
+
+    readers = [threading.Thread(target=drain_stdout, daemon=True),
+               threading.Thread(target=drain_stderr, daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    try:
+        # Chunk by chunk, so memory-mapped audio is never copied whole
+        for start in range(0, len(audio), CHUNK_SAMPLES):
+            process.stdin.write(np.ascontiguousarray(audio[start:start + CHUNK_SAMPLES], dtype=np.float32).tobytes())
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    for reader in readers:
+        reader.join()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to change tempo: {b''.join(stderr).decode(errors='replace')[-500:]}")
+
+    return np.frombuffer(bytes(pcm), np.float32)
+
+
+def rescale_segment(segment: Dict, tempo: float) -> Dict:
+    """Copy of a segment transcribed from sped-up audio, with timestamps on the original timeline."""
+    segment = dict(segment)
+    segment["start"] = segment["start"] * tempo
+    segment["end"] = segment["end"] * tempo
+    # Whisper's seek counts 10 ms mel frames
+    segment["seek"] = int(segment.get("seek", 0) * tempo)
+    return segment
+
+
+def rescale_result(result: Dict, tempo: float) -> Dict:
+    """Whisper-format result from sped-up audio, mapped back to the original timeline."""
+    return dict(
+        result,
+        segments=[rescale_segment(segment, tempo) for segment in result.get("segments", [])],
+        audio_tempo=tempo
+    )
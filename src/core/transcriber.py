@@ -1,49 +1,106 @@
 """Audio transcription using Whisper."""
 
 import os
-import whisper
-from typing import Dict, Optional
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from .batch_transcriber import BatchTranscriber
+from .config import Config
+from .decode_profiles import DecodeProfile, get_decode_profile
+from .model_registry import ModelRegistry
+from .parallel_transcriber import ParallelTranscriber, get_parallel_transcriber
+from .pcm_cache import PcmCache, get_pcm_cache
+from .segment_refiner import SegmentRefiner
+from .segment_store import SegmentStore
+from .tempo import rescale_result, rescale_segment, time_stretch
+from .stream_decoder import SAMPLE_RATE, StreamingDecoder
+from .transcription_checkpoint import TranscriptionCheckpoints
+from .transcription_engines import TranscriptionEngine, WhisperEngine, create_engine, shift_segment
+from .vad import split_windows
 
 
 class Transcriber:
     """Transcribes audio files using OpenAI Whisper."""
     
-    def __init__(self, model_name: str = "base"):
+    def __init__(self, model_name: str = "base", model_registry: Optional[ModelRegistry] = None,
+                 engine: Optional[TranscriptionEngine] = None, pcm_cache: Optional[PcmCache] = None,
+                 tempo: float = None):
         """
         Initialize transcriber with specified Whisper model.
         
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
+            model_registry: Registry the model is loaded from (the shared one by default)
+            engine: Transcription engine (Config.TRANSCRIPTION_ENGINE by default)
+            pcm_cache: Cache of decoded audio (the shared one if Config.PCM_CACHE_ENABLED)
+            tempo: Speed-up applied before transcription (Config.AUDIO_TEMPO by default; 1.0 for none)
         """
         self.model_name = model_name
-        self.model = None
+        self.tempo = tempo or Config.AUDIO_TEMPO
+        self.pcm_cache = pcm_cache or (get_pcm_cache() if Config.PCM_CACHE_ENABLED else None)
+        self.engine = engine or create_engine(model_name=model_name, model_registry=model_registry)
+        self.parallel: Optional[ParallelTranscriber] = None
+        if Config.PARALLEL_TRANSCRIPTION and Config.TRANSCRIPTION_WORKERS > 1:
+            self.parallel = get_parallel_transcriber(self.engine.name, model_name)
+        self.checkpoints: Optional[TranscriptionCheckpoints] = None
+        if Config.TRANSCRIPTION_CHECKPOINTS:
+            self.checkpoints = TranscriptionCheckpoints()
+        self.refiner: Optional[SegmentRefiner] = None
+        if Config.REFINE_MODEL and Config.REFINE_MODEL != model_name:
+            self.refiner = SegmentRefiner(model_registry=model_registry)
     
-    def _load_model(self) -> None:
-        """Load Whisper model (lazy loading)."""
-        if self.model is None:
-            print(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
+    def _load_model(self):
+        """Get the engine's model, loaded once per process by the model registry."""
+        return self.engine.load()
     
-    def transcribe_audio(self, audio_path: str) -> Optional[Dict]:
+    def transcribe_audio(self, audio_path: Union[str, np.ndarray],
+                         decode_profile: Optional[str] = None) -> Optional[Dict]:
         """
         Transcribe audio file to text.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or already decoded 16 kHz mono PCM
+            decode_profile: Name of the decode profile (Config.DECODE_PROFILE by default)
             
         Returns:
-            Transcription result dictionary or None if failed
+            Transcription result dictionary (with the profile used under "decode_profile") or None if failed
         """
         try:
-            self._load_model()
-            
-            if not os.path.exists(audio_path):
+            profile = get_decode_profile(decode_profile)
+            options = self.engine.decode_options(profile)
+            if isinstance(audio_path, np.ndarray):
+                print(f"Transcribing {len(audio_path) / SAMPLE_RATE:.0f}s of decoded audio")
+            elif not os.path.exists(audio_path):
                 print(f"Audio file not found: {audio_path}")
                 return None
+            else:
+                print(f"Transcribing: {audio_path}")
+            print(f"Decode profile: {profile.label}")
+            
+            audio = audio_path
+            if self.pcm_cache or self.checkpoints or self.parallel or self.refiner or self.tempo != 1.0:
+                audio = self._decode(audio_path)
+            if self.tempo != 1.0:
+                # Less audio to decode; timestamps are mapped back to the original timeline below
+                print(f"Compressing audio to {self.tempo:g}x tempo")
+                audio = time_stretch(audio, self.tempo)
             
-            print(f"Transcribing: {audio_path}")
-            result = self.model.transcribe(audio_path)
+            if self.checkpoints:
+                # Window by window, saving progress so a restarted job picks up where this one stopped
+                result = self._transcribe_checkpointed(audio, profile)
+            elif self.parallel:
+                # Split at silences and transcribe the windows across worker processes
+                result = self.parallel.transcribe(audio, options)
+            else:
+                result = self.engine.transcribe(audio, **options)
             
+            if self.refiner:
+                # Second pass over just the low-confidence segments
+                result = self.refiner.refine(audio, result, profile)
+            
+            if self.tempo != 1.0:
+                result = rescale_result(result, self.tempo)
+            result["decode_profile"] = profile.label
             print("Transcription completed")
             return result
             
@@ -51,8 +108,136 @@ class Transcriber:
             print(f"Error during transcription: {e}")
             return None
     
+    def transcribe_batch(self, audio_paths: Sequence[Union[str, np.ndarray]],
+                         decode_profile: Optional[str] = None) -> List[Optional[Dict]]:
+        """
+        Transcribe many episodes for a bulk job, batching their windows through the model.
+        
+        Engines without batch decoding transcribe the episodes one at a time.
+        
+        Args:
+            audio_paths: Paths to audio files, or already decoded 16 kHz mono PCM
+            decode_profile: Name of the decode profile (Config.DECODE_PROFILE by default)
+            
+        Returns:
+            Transcription result dictionaries in input order (None for episodes that failed)
+        """
+        if not isinstance(self.engine, WhisperEngine):
+            return [self.transcribe_audio(audio_path, decode_profile) for audio_path in audio_paths]
+        
+        batch_transcriber = BatchTranscriber(self.model_name, self.engine.model_registry, pcm_cache=self.pcm_cache)
+        try:
+            return batch_transcriber.transcribe(audio_paths, decode_profile)
+        except Exception as e:
+            print(f"Error during batch transcription: {e}")
+            return [None] * len(audio_paths)
+    
+    def iter_segments(self, audio_path: Union[str, np.ndarray],
+                      decode_profile: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Transcribe audio incrementally, yielding segments as they are decoded.
+        
+        Engines that stream natively yield segment by segment. Otherwise the
+        audio is split at silences and each window's segments are yielded as
+        soon as that window is done (on the worker pool in parallel mode).
+        
+        Args:
+            audio_path: Path to audio file, or already decoded 16 kHz mono PCM
+            decode_profile: Name of the decode profile (Config.DECODE_PROFILE by default)
+            
+        Yields:
+            Segments in order, with timestamps in episode time
+            
+        Raises:
+            FileNotFoundError: If the audio file does not exist
+        """
+        if not isinstance(audio_path, np.ndarray) and not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        options = self.engine.decode_options(get_decode_profile(decode_profile))
+        
+        if self.tempo == 1.0:
+            yield from self._iter_segments(audio_path, options)
+            return
+        
+        # Sped-up audio, with each segment mapped back to the original timeline
+        audio = time_stretch(self._decode(audio_path), self.tempo)
+        for segment in self._iter_segments(audio, options):
+            yield rescale_segment(segment, self.tempo)
+    
+    def _iter_segments(self, audio_path: Union[str, np.ndarray], options: Dict) -> Iterator[Dict]:
+        if self.engine.streams_segments and not self.parallel:
+            # The engine decodes files itself, unless the PCM cache already has them
+            audio = self._decode(audio_path) if self.pcm_cache else audio_path
+            yield from self.engine.iter_segments(audio, **options)
+            return
+        
+        audio = self._decode(audio_path)
+        
+        if self.parallel:
+            yield from self.parallel.iter_segments(audio, options)
+            return
+        
+        segment_id = 0
+        for window in split_windows(audio, Config.STREAMING_WINDOW_SECONDS):
+            for segment in self.engine.transcribe(audio[window.start:window.end], **options)["segments"]:
+                yield shift_segment(segment, window.start_seconds, segment_id)
+                segment_id += 1
+    
+    def _transcribe_checkpointed(self, audio: np.ndarray, profile: DecodeProfile) -> Dict:
+        """
+        Transcribe silence-split windows in order, checkpointing finished ones.
+        
+        Windows come from the same VAD split every time, so a resumed job skips
+        exactly the windows before the checkpoint's decoder position.
+        """
+        key = self.checkpoints.key(audio, self.engine.name, self.model_name, profile.label)
+        options = self.engine.decode_options(profile)
+        state = self.checkpoints.load(key)
+        windows = split_windows(audio)
+        pending = [window for window in windows if window.start >= state.next_sample]
+        if state.windows_done:
+            print(f"Resuming from checkpoint: {state.windows_done}/{len(windows)} windows "
+                  f"({state.next_sample / SAMPLE_RATE:.0f}s) already transcribed")
+        
+        if self.parallel:
+            results = self.parallel.map_windows(audio, pending, options)
+        else:
+            results = (self.engine.transcribe(audio[w.start:w.end], **options) for w in pending)
+        
+        try:
+            for window, result in zip(pending, results):
+                state.language = state.language or result.get("language")
+                for segment in result.get("segments", []):
+                    state.segments.append(shift_segment(segment, window.start_seconds, len(state.segments)))
+                state.next_sample = int(window.end)
+                state.windows_done += 1
+                self.checkpoints.save(state)
+        except Exception:
+            # Keep everything finished so far for the retry
+            self.checkpoints.save(state, force=True)
+            raise
+        
+        self.checkpoints.clear(key)
+        return {
+            "text": "".join(segment["text"] for segment in state.segments),
+            "segments": state.segments,
+            "language": state.language
+        }
+    
+    def _decode(self, audio_path: Union[str, np.ndarray]) -> np.ndarray:
+        """16 kHz mono PCM for a path (memory-mapped from the PCM cache if enabled), or the array itself."""
+        if isinstance(audio_path, np.ndarray):
+            return audio_path
+        if self.pcm_cache:
+            return self.pcm_cache.get(audio_path)
+        return StreamingDecoder().decode_file(audio_path).audio
+    
     def get_transcript_text(self, transcription_result: Dict) -> str:
         """Extract raw text from transcription result."""
         if transcription_result and 'text' in transcription_result:
             return transcription_result['text']
         return ""
+    
+    def get_segment_store(self, transcription_result: Dict) -> SegmentStore:
+        """Keep the result's segments, timestamps and confidences in a compact store."""
+        return SegmentStore.from_segments((transcription_result or {}).get('segments', []))
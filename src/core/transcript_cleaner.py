@@ -2,7 +2,7 @@
 
 import openai
 import tiktoken
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional
 from .config import Config
 
 
@@ -122,8 +122,66 @@ class TranscriptCleaner:
             cleaned_chunks.append(cleaned_chunk)
             
             # Extract final lines for next chunk context
-            lines = [line.strip() for line in cleaned_chunk.strip().split('\n') if line.strip()]
-            if lines:
-                prior_lines = "\n".join(lines[-2:])  # Keep last 2 lines for context
+            prior_lines = self._last_lines(cleaned_chunk) or prior_lines
         
         return "\n".join(cleaned_chunks)
+    
+    def clean_stream(self, text_pieces: Iterable[str], podcast_description: str,
+                     speakers: Dict[str, List[str]]) -> Iterator[str]:
+        """
+        Clean a transcription that arrives piece by piece (e.g. segment texts).
+        
+        A chunk is cleaned as soon as enough complete sentences have arrived to
+        fill it, so cleaning overlaps with transcription. Chunks are the same
+        size as in clean_transcription, and the text after the last sentence
+        break is held back until the sentence is complete.
+        
+        Args:
+            text_pieces: Raw transcript text in order
+            podcast_description: Description of the episode for the prompt
+            speakers: Host, cohosts and guests
+            
+        Yields:
+            Cleaned chunks in order
+        """
+        buffer = ""
+        buffer_tokens = 0
+        prior_lines = None
+        chunk_number = 0
+        
+        for piece in text_pieces:
+            buffer += piece
+            buffer_tokens += len(self.encoder.encode(piece))
+            if buffer_tokens <= self.max_tokens_input:
+                continue
+            
+            # Chunk the complete sentences; an unfinished one waits for more text
+            boundary = buffer.rfind('. ')
+            if boundary == -1 and buffer_tokens <= 2 * self.max_tokens_input:
+                continue
+            complete, tail = (buffer, "") if boundary == -1 else (buffer[:boundary + 1], buffer[boundary + 2:])
+            chunks = self.split_into_chunks(complete)
+            
+            # The last chunk may not be full yet; it goes back in front of the tail
+            last_chunk = chunks.pop()
+            buffer = f"{last_chunk} {tail}" if tail else last_chunk
+            buffer_tokens = len(self.encoder.encode(buffer))
+            
+            for chunk in chunks:
+                chunk_number += 1
+                print(f"Cleaning chunk {chunk_number} (streaming)")
+                cleaned_chunk = self.clean_chunk(chunk, podcast_description, speakers, prior_lines)
+                prior_lines = self._last_lines(cleaned_chunk) or prior_lines
+                yield cleaned_chunk
+        
+        for chunk in self.split_into_chunks(buffer):
+            chunk_number += 1
+            print(f"Cleaning chunk {chunk_number} (streaming)")
+            cleaned_chunk = self.clean_chunk(chunk, podcast_description, speakers, prior_lines)
+            prior_lines = self._last_lines(cleaned_chunk) or prior_lines
+            yield cleaned_chunk
+    
+    def _last_lines(self, cleaned_chunk: str) -> Optional[str]:
+        """Last 2 lines of a cleaned chunk, as context for the next one."""
+        lines = [line.strip() for line in cleaned_chunk.strip().split('\n') if line.strip()]
+        return "\n".join(lines[-2:]) if lines else None
@@ -1,9 +1,11 @@
 """Abstract base class for transcript sources."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 from dataclasses import dataclass
 
+from .segment_store import SegmentStore
+
 
 @dataclass
 class TranscriptMetadata:
@@ -20,6 +22,16 @@ class TranscriptResult:
     """Result from transcript extraction."""
     raw_text: str
     metadata: TranscriptMetadata
+    segments: Optional[SegmentStore] = None  # Timed segments, for sources that have them
+    decode_profile: Optional[str] = None  # Decode profile used, for sources that transcribe audio
+
+
+@dataclass
+class TranscriptStream:
+    """Transcript delivered incrementally: metadata up front, segments as they are transcribed."""
+    metadata: TranscriptMetadata
+    segments: Iterator[Dict]  # Whisper-style segments; only "text" is guaranteed
+    decode_profile: Optional[str] = None
 
 
 class TranscriptSource(ABC):
@@ -31,10 +43,15 @@ class TranscriptSource(ABC):
         pass
     
     @abstractmethod
-    def extract_transcript(self, url: str) -> TranscriptResult:
-        """Extract transcript from the URL."""
+    def extract_transcript(self, url: str, decode_profile: Optional[str] = None) -> TranscriptResult:
+        """Extract transcript from the URL, transcribing with the named decode profile if needed."""
         pass
     
+    def stream_transcript(self, url: str, decode_profile: Optional[str] = None) -> TranscriptStream:
+        """Extract transcript incrementally; sources that can't stream yield it as one segment."""
+        result = self.extract_transcript(url, decode_profile)
+        return TranscriptStream(result.metadata, iter([{"text": result.raw_text}]), result.decode_profile)
+    
     @abstractmethod
     def validate_url(self, url: str) -> bool:
         """Validate if URL is supported by this source."""
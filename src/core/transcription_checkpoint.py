@@ -0,0 +1,118 @@
+"""On-disk checkpoints that let an interrupted transcription resume."""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .config import Config
+
+
+def pcm_content_hash(audio: np.ndarray) -> str:
+    """SHA-256 of decoded PCM, so the same audio matches whatever file it came from."""
+    return hashlib.sha256(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B")).hexdigest()
+
+
+@dataclass
+class CheckpointState:
+    """Progress of one transcription: finished segments and where decoding stopped."""
+    key: str
+    next_sample: int = 0  # Windows starting before this sample are done
+    windows_done: int = 0
+    language: Optional[str] = None
+    segments: List[Dict] = field(default_factory=list)  # Episode-time segments so far
+    saved_at: float = 0.0
+
+
+class TranscriptionCheckpoints:
+    """Saves transcription progress window by window so a retried job skips finished work.
+
+    Checkpoints are keyed by the audio's content plus the engine, model and
+    decode options, so a resume never mixes output from different settings.
+    A checkpoint is written at most every ``interval_seconds`` (atomically,
+    so a kill mid-write leaves the previous one) and deleted once the
+    transcription completes.
+    """
+
+    def __init__(self, checkpoint_folder: str = None, interval_seconds: float = None,
+                 max_age_seconds: float = None):
+        """
+        Initialize the checkpoint store.
+
+        Args:
+            checkpoint_folder: Directory holding checkpoint files
+            interval_seconds: Minimum time between checkpoint writes
+            max_age_seconds: Checkpoints older than this are ignored and removed
+        """
+        self.checkpoint_folder = checkpoint_folder or Config.CHECKPOINT_FOLDER
+        self.interval_seconds = interval_seconds if interval_seconds is not None else Config.CHECKPOINT_INTERVAL
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else Config.CHECKPOINT_MAX_AGE
+        os.makedirs(self.checkpoint_folder, exist_ok=True)
+
+    def key(self, audio: np.ndarray, engine_name: str, model_name: str, options: str = "") -> str:
+        """Checkpoint key for transcribing this audio with these settings."""
+        settings = f"{engine_name}|{model_name}|{options}"
+        return hashlib.sha256(f"{pcm_content_hash(audio)}|{settings}".encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> CheckpointState:
+        """Load the checkpoint for a key, or a fresh state if there is none."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age_seconds:
+                self.clear(key)
+                return CheckpointState(key)
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return CheckpointState(
+                key=key,
+                next_sample=data["next_sample"],
+                windows_done=data["windows_done"],
+                language=data.get("language"),
+                segments=data["segments"],
+                saved_at=data.get("saved_at", 0.0)
+            )
+        except (OSError, ValueError, KeyError):
+            return CheckpointState(key)
+
+    def save(self, state: CheckpointState, force: bool = False) -> bool:
+        """
+        Write a checkpoint if the interval has passed since the last one.
+
+        Args:
+            state: Progress to save
+            force: Write regardless of the interval
+
+        Returns:
+            True if a checkpoint was written
+        """
+        now = time.time()
+        if not force and now - state.saved_at < self.interval_seconds:
+            return False
+
+        state.saved_at = now
+        path = self._path(state.key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "next_sample": state.next_sample,
+                "windows_done": state.windows_done,
+                "language": state.language,
+                "segments": state.segments,
+                "saved_at": state.saved_at
+            }, f)
+        os.replace(tmp_path, path)
+        return True
+
+    def clear(self, key: str) -> None:
+        """Remove a checkpoint once its transcription has completed."""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.checkpoint_folder, f"{key}.json")
@@ -0,0 +1,405 @@
+"""Speech-to-text engines behind Transcriber."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from .config import Config
+from .decode_profiles import DecodeProfile
+from .model_registry import ModelRegistry, get_model_registry
+from .stream_decoder import SAMPLE_RATE
+from .vad import SpeechWindow
+
+
+# Keys every engine fills in for each segment (Whisper's own segment format)
+SEGMENT_DEFAULTS = {
+    "id": 0, "seek": 0, "start": 0.0, "end": 0.0, "text": "", "tokens": [],
+    "temperature": 0.0, "avg_logprob": 0.0, "compression_ratio": 0.0, "no_speech_prob": 0.0
+}
+
+# Whisper's own thresholds for a failed decode (retried at a higher temperature) and for silence
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+# Seconds per timestamp token
+TIMESTAMP_PRECISION = 0.02
+
+
+class TranscriptionEngine(ABC):
+    """A speech-to-text backend.
+
+    Engines load their model through the model registry and return results in
+    openai-whisper's format: ``{"text", "segments", "language"}``, with every
+    segment carrying the keys in SEGMENT_DEFAULTS.
+    """
+
+    name = ""
+    # Whether iter_segments() yields segments while the backend is still decoding
+    streams_segments = False
+    # Whether one loaded model can decode for several threads at once
+    thread_safe = False
+
+    def __init__(self, model_name: str = "base", model_registry: Optional[ModelRegistry] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            model_name: Whisper model size (tiny, base, small, medium, large)
+            model_registry: Registry the model is loaded from (the shared one by default)
+        """
+        self.model_name = model_name
+        self.model_registry = model_registry or get_model_registry()
+
+    @property
+    def registry_key(self) -> str:
+        """Key of this engine's model in the model registry."""
+        return f"{self.name}:{self.model_name}"
+
+    def load(self) -> Any:
+        """Get the engine's model, loading it once per process."""
+        return self.model_registry.get(self.registry_key, self._load_model)
+
+    def prewarm(self):
+        """Load the model in the background; see ModelRegistry.prewarm."""
+        return self.model_registry.prewarm([self.registry_key], self._load_model)
+
+    def transcribe(self, audio: Union[str, np.ndarray], **options) -> Dict:
+        """
+        Transcribe an audio file or 16 kHz mono float32 PCM.
+
+        The model is held for the whole call, so the registry can't unload it
+        mid-transcription, and calls on a model that isn't thread-safe run
+        one at a time.
+
+        Args:
+            audio: Audio file path or decoded samples
+            **options: Decoding options passed to the backend
+
+        Returns:
+            Dict with text, segments and language
+        """
+        with self._use_model() as model:
+            return self._transcribe(model, audio, **options)
+
+    def iter_segments(self, audio: Union[str, np.ndarray], **options) -> Iterator[Dict]:
+        """
+        Yield segments of an audio file or PCM as they are decoded.
+
+        Engines that can't stream (streams_segments is False) yield every
+        segment once the whole transcription is done.
+
+        Args:
+            audio: Audio file path or decoded samples
+            **options: Decoding options passed to the backend
+
+        Yields:
+            Segments in order, with the keys in SEGMENT_DEFAULTS
+        """
+        yield from self.transcribe(audio, **options)["segments"]
+
+    def decode_options(self, profile: DecodeProfile) -> Dict:
+        """Keyword arguments for transcribe() that apply a decode profile on this backend."""
+        options = {
+            "beam_size": profile.beam_size,
+            "best_of": profile.best_of,
+            "temperature": profile.temperatures,
+            "fp16": profile.fp16,
+            "condition_on_previous_text": profile.condition_on_previous_text
+        }
+        if profile.language:
+            options["language"] = profile.language
+        return options
+
+    def _use_model(self):
+        """Hold the model for a block, exclusively unless the backend is thread-safe."""
+        return self.model_registry.use(self.registry_key, self._load_model, exclusive=not self.thread_safe)
+
+    @abstractmethod
+    def _load_model(self, registry_key: str) -> Any:
+        """Load the backend model (called by the registry)."""
+
+    @abstractmethod
+    def _transcribe(self, model: Any, audio: Union[str, np.ndarray], **options) -> Dict:
+        """Run the backend on a loaded model."""
+
+
+class WhisperEngine(TranscriptionEngine):
+    """The reference openai-whisper PyTorch implementation.
+
+    Not thread-safe: each decode installs key/value cache hooks on the shared
+    decoder, so concurrent decodes would write into each other's caches.
+    """
+
+    name = "whisper"
+
+    @property
+    def registry_key(self) -> str:
+        # Plain model size, as Whisper models were keyed before other engines existed
+        return self.model_name
+
+    def _load_model(self, registry_key: str) -> Any:
+        import torch
+        import whisper
+
+        if Config.TRANSCRIPTION_CPU_THREADS:
+            torch.set_num_threads(Config.TRANSCRIPTION_CPU_THREADS)
+        if Config.TRANSCRIPTION_NUM_WORKERS > 1:
+            try:
+                torch.set_num_interop_threads(Config.TRANSCRIPTION_NUM_WORKERS)
+            except RuntimeError:
+                # Can only be set before the first parallel PyTorch op in the process
+                pass
+        return whisper.load_model(self.model_name)
+
+    def _transcribe(self, model: Any, audio: Union[str, np.ndarray], **options) -> Dict:
+        result = model.transcribe(audio, **options)
+        result["segments"] = [_segment(segment) for segment in result.get("segments", [])]
+        return result
+
+    def decode_windows(self, windows: Sequence[np.ndarray], profile: DecodeProfile) -> List[Dict]:
+        """
+        Decode up to 30 s windows of PCM as one batch through the encoder and decoder.
+
+        The batch is decoded at the profile's first temperature; windows that
+        fail Whisper's quality checks are transcribed again on their own with
+        the full fallback schedule. Silent windows come back without segments.
+
+        Args:
+            windows: Float32 16 kHz mono samples, each at most 30 s
+            profile: Decode profile
+
+        Returns:
+            A Whisper-format result per window, with window-relative timestamps
+        """
+        import torch
+        import whisper
+
+        with self._use_model() as model:
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(np.array(window, dtype=np.float32)), model.dims.n_mels)
+                for window in windows
+            ]).to(model.device)
+            temperature = profile.temperatures[0]
+            # English-only models have no language tokens to detect with
+            language = profile.language or (None if model.is_multilingual else "en")
+            options = whisper.DecodingOptions(
+                task="transcribe",
+                language=language,
+                temperature=temperature,
+                beam_size=profile.beam_size if temperature == 0 else None,
+                best_of=profile.best_of if temperature > 0 else None,
+                fp16=profile.fp16 and model.device.type == "cuda",
+                without_timestamps=False
+            )
+            decoded = whisper.decode(model, mel, options)
+            tokenizer = whisper.tokenizer.get_tokenizer(
+                model.is_multilingual, num_languages=model.num_languages, task="transcribe"
+            )
+            results = [
+                self._window_result(result, tokenizer, len(window) / SAMPLE_RATE)
+                for window, result in zip(windows, decoded)
+            ]
+
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = self.transcribe(windows[index], **self.decode_options(profile))
+        return results
+
+    def _window_result(self, result: Any, tokenizer: Any, duration: float) -> Optional[Dict]:
+        """Whisper-format result for one decoded window, or None if it needs the fallback schedule."""
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            return {"text": "", "segments": [], "language": result.language}
+        if result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD:
+            return None
+
+        segments = []
+        for start, end, tokens in _timestamped_spans(list(result.tokens), tokenizer.timestamp_begin, duration):
+            segments.append(_segment({
+                "id": len(segments),
+                "start": start,
+                "end": end,
+                "text": tokenizer.decode(tokens),
+                "tokens": tokens,
+                "temperature": result.temperature,
+                "avg_logprob": result.avg_logprob,
+                "compression_ratio": result.compression_ratio,
+                "no_speech_prob": result.no_speech_prob
+            }))
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": result.language
+        }
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """faster-whisper (CTranslate2), with int8 quantization for CPU workers.
+
+    ``cpu_threads`` is the intra-op thread count of one transcription and
+    ``num_workers`` the number of transcriptions the model runs in parallel.
+    """
+
+    name = "faster-whisper"
+    streams_segments = True
+    # CTranslate2 runs up to num_workers transcriptions on one model
+    thread_safe = True
+
+    def __init__(self, model_name: str = "base", model_registry: Optional[ModelRegistry] = None,
+                 compute_type: str = None, cpu_threads: int = None, num_workers: int = None):
+        """
+        Initialize the engine.
+
+        Args:
+            model_name: Whisper model size (tiny, base, small, medium, large)
+            model_registry: Registry the model is loaded from (the shared one by default)
+            compute_type: CTranslate2 compute type (int8, int8_float32, float32, ...)
+            cpu_threads: Intra-op threads (0 for the library default)
+            num_workers: Inter-op workers, i.e. concurrent transcriptions
+        """
+        super().__init__(model_name, model_registry)
+        self.compute_type = compute_type or Config.TRANSCRIPTION_COMPUTE_TYPE
+        self.cpu_threads = cpu_threads if cpu_threads is not None else Config.TRANSCRIPTION_CPU_THREADS
+        self.num_workers = num_workers or Config.TRANSCRIPTION_NUM_WORKERS
+
+    @property
+    def registry_key(self) -> str:
+        return f"{self.name}:{self.model_name}:{self.compute_type}"
+
+    def _load_model(self, registry_key: str) -> Any:
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("The faster-whisper engine needs the faster-whisper package: pip install faster-whisper")
+
+        return WhisperModel(
+            self.model_name,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers
+        )
+
+    def decode_options(self, profile: DecodeProfile) -> Dict:
+        # Precision is the model's compute_type here, and greedy is a beam of one
+        return {
+            "beam_size": profile.beam_size or 1,
+            "best_of": profile.best_of or 1,
+            "temperature": list(profile.temperatures),
+            "condition_on_previous_text": profile.condition_on_previous_text,
+            "language": profile.language
+        }
+
+    def _transcribe(self, model: Any, audio: Union[str, np.ndarray], **options) -> Dict:
+        segments, info = model.transcribe(audio, **options)
+        converted = list(self._convert_segments(segments))
+        return {
+            "text": "".join(segment["text"] for segment in converted),
+            "segments": converted,
+            "language": info.language
+        }
+
+    def iter_segments(self, audio: Union[str, np.ndarray], **options) -> Iterator[Dict]:
+        # faster-whisper decodes lazily, one segment per step of its generator
+        with self._use_model() as model:
+            segments, _ = model.transcribe(audio, **options)
+            yield from self._convert_segments(segments)
+
+    def _convert_segments(self, segments) -> Iterator[Dict]:
+        for index, segment in enumerate(segments):
+            yield _segment({
+                "id": index,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob
+            })
+
+
+ENGINES: Dict[str, Type[TranscriptionEngine]] = {
+    WhisperEngine.name: WhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine
+}
+
+
+def create_engine(engine_name: str = None, model_name: str = None,
+                  model_registry: Optional[ModelRegistry] = None) -> TranscriptionEngine:
+    """
+    Create a transcription engine by name.
+
+    Args:
+        engine_name: One of ENGINES (Config.TRANSCRIPTION_ENGINE by default)
+        model_name: Whisper model size (Config.WHISPER_MODEL by default)
+        model_registry: Registry models are loaded from
+
+    Returns:
+        The engine
+
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    engine_name = engine_name or Config.TRANSCRIPTION_ENGINE
+    if engine_name not in ENGINES:
+        raise ValueError(f"Unknown transcription engine: {engine_name} (choose from {', '.join(ENGINES)})")
+    return ENGINES[engine_name](model_name or Config.WHISPER_MODEL, model_registry)
+
+
+def shift_segment(segment: Dict, offset_seconds: float, segment_id: int) -> Dict:
+    """Copy of a segment from a window of audio, moved to episode time and renumbered."""
+    segment = dict(segment)
+    segment["id"] = segment_id
+    segment["start"] = segment["start"] + offset_seconds
+    segment["end"] = segment["end"] + offset_seconds
+    # Whisper's seek counts 10 ms mel frames
+    segment["seek"] = segment.get("seek", 0) + int(offset_seconds * 100)
+    return segment
+
+
+def stitch_windows(window_results: Sequence[Tuple[SpeechWindow, Dict]]) -> Dict:
+    """Merge per-window results in order into one result, shifting timestamps to episode time."""
+    segments = []
+    language = None
+    for window, result in window_results:
+        language = language or result.get("language")
+        for segment in result.get("segments", []):
+            segments.append(shift_segment(segment, window.start_seconds, len(segments)))
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language
+    }
+
+
+def _timestamped_spans(tokens: List[int], timestamp_begin: int,
+                       duration: float) -> Iterator[Tuple[float, float, List[int]]]:
+    """Split decoded tokens at timestamp tokens into (start, end, text tokens) spans."""
+    start = 0.0
+    text_tokens: List[int] = []
+    for token in tokens:
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+        time = min((token - timestamp_begin) * TIMESTAMP_PRECISION, duration)
+        if text_tokens:
+            yield start, max(time, start), text_tokens
+            text_tokens = []
+        start = time
+    if text_tokens:
+        # The window ran out before a closing timestamp
+        yield start, duration, text_tokens
+
+
+def _segment(segment: Dict) -> Dict:
+    """Segment restricted to the shared keys, with defaults for any the backend omits."""
+    converted = {key: segment.get(key, default) for key, default in SEGMENT_DEFAULTS.items()}
+    converted["start"] = float(converted["start"])
+    converted["end"] = float(converted["end"])
+    converted["tokens"] = list(converted["tokens"])
+    return converted
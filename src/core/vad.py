@@ -0,0 +1,142 @@
+"""Energy-based voice activity detection for splitting long episodes."""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .config import Config
+from .stream_decoder import SAMPLE_RATE
+
+# Samples measured per step of frame_energy_db (about a minute of audio)
+FRAME_BLOCK_SAMPLES = 60 * SAMPLE_RATE
+
+@dataclass
+class SpeechWindow:
+    """A stretch of audio to transcribe on its own, in samples."""
+    start: int
+    end: int
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start / SAMPLE_RATE
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.end - self.start) / SAMPLE_RATE
+
+
+def frame_energy_db(audio: np.ndarray, frame_samples: int) -> np.ndarray:
+    """RMS level of consecutive frames in dBFS."""
+    frames = len(audio) // frame_samples
+    if frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    rms = np.empty(frames, dtype=np.float32)
+    # A block of frames at a time, so hours of (possibly memory-mapped) audio are never squared in one copy
+    block = max(1, FRAME_BLOCK_SAMPLES // frame_samples)
+    for first in range(0, frames, block):
+        last = min(frames, first + block)
+        framed = audio[first * frame_samples:last * frame_samples].reshape(last - first, frame_samples)
+        rms[first:last] = np.sqrt(np.mean(np.square(framed, dtype=np.float32), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(audio: np.ndarray, frame_ms: int = None, margin_db: float = None,
+                  max_threshold_db: float = None, min_silence_ms: int = None,
+                  pad_ms: int = None) -> List[Tuple[int, int]]:
+    """
+    Find speech regions in 16 kHz mono PCM.
+
+    A frame counts as speech when it is louder than the noise floor (the 10th
+    percentile frame level) by margin_db, capped at max_threshold_db so quiet
+    speech in a noisy recording is not lost. Gaps shorter than min_silence_ms
+    are bridged and every region is padded by pad_ms.
+
+    Args:
+        audio: Float32 samples in [-1, 1]
+        frame_ms: Analysis frame length
+        margin_db: Level above the noise floor that counts as speech
+        max_threshold_db: Upper bound on the speech threshold in dBFS
+        min_silence_ms: Shortest silence that separates two regions
+        pad_ms: Padding kept around each region
+
+    Returns:
+        (start, end) sample ranges of speech, in order
+    """
+    frame_ms = frame_ms or Config.VAD_FRAME_MS
+    margin_db = margin_db if margin_db is not None else Config.VAD_MARGIN_DB
+    max_threshold_db = max_threshold_db if max_threshold_db is not None else Config.VAD_MAX_THRESHOLD_DB
+    min_silence_ms = min_silence_ms if min_silence_ms is not None else Config.VAD_MIN_SILENCE_MS
+    pad_ms = pad_ms if pad_ms is not None else Config.VAD_PAD_MS
+
+    frame_samples = SAMPLE_RATE * frame_ms // 1000
+    levels = frame_energy_db(audio, frame_samples)
+    if len(levels) == 0:
+        return []
+
+    threshold = min(np.percentile(levels, 10) + margin_db, max_threshold_db)
+    speech = levels > threshold
+
+    # Frame indices where speech starts and stops
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_gap = max(1, min_silence_ms // frame_ms)
+    pad = SAMPLE_RATE * pad_ms // 1000
+    regions: List[Tuple[int, int]] = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+
+    return [
+        (max(0, start * frame_samples - pad), min(len(audio), end * frame_samples + pad))
+        for start, end in regions
+    ]
+
+
+def split_windows(audio: np.ndarray, max_window_seconds: float = None) -> List[SpeechWindow]:
+    """
+    Group speech regions into windows of at most max_window_seconds.
+
+    Windows end at silences, so no word is cut in half. Regions are joined
+    into one window across pauses of up to VAD_MERGE_GAP_SECONDS; longer
+    silences are left out entirely. A single region longer than the limit is
+    cut at its quietest frame near the limit.
+
+    Args:
+        audio: Float32 16 kHz mono samples
+        max_window_seconds: Longest window to transcribe in one piece
+
+    Returns:
+        Windows in order
+    """
+    max_samples = int((max_window_seconds or Config.VAD_MAX_WINDOW_SECONDS) * SAMPLE_RATE)
+    merge_gap = int(Config.VAD_MERGE_GAP_SECONDS * SAMPLE_RATE)
+    windows: List[SpeechWindow] = []
+
+    for start, end in detect_speech(audio):
+        if windows:
+            # Padding can make neighbouring regions overlap
+            start = max(start, windows[-1].end)
+        while end - start > max_samples:
+            cut = _quietest_cut(audio, start + max_samples // 2, start + max_samples)
+            windows.append(SpeechWindow(start, cut))
+            start = cut
+        if windows and start - windows[-1].end <= merge_gap and end - windows[-1].start <= max_samples:
+            windows[-1].end = end
+        else:
+            windows.append(SpeechWindow(start, end))
+
+    return windows
+
+
+def _quietest_cut(audio: np.ndarray, low: int, high: int) -> int:
+    """Sample position of the quietest frame between low and high."""
+    frame_samples = SAMPLE_RATE * Config.VAD_FRAME_MS // 1000
+    levels = frame_energy_db(audio[low:high], frame_samples)
+    if len(levels) == 0:
+        return high
+    return low + int(np.argmin(levels)) * frame_samples
@@ -1,6 +1,7 @@
 """YouTube transcript source implementation."""
 
 import re
+from typing import Optional
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -10,6 +11,7 @@ from youtube_transcript_api._errors import (
 )
 
 from .transcript_source import TranscriptSource, TranscriptMetadata, TranscriptResult
+from .http_client import get_http_client
 
 
 class YouTubeSource(TranscriptSource):
@@ -86,8 +88,8 @@ class YouTubeSource(TranscriptSource):
             raise RuntimeError(f"Failed to extract YouTube metadata: {e}")
 
 
-    def extract_transcript(self, url: str) -> TranscriptResult:
-        """Extract transcript from YouTube video."""
+    def extract_transcript(self, url: str, decode_profile: Optional[str] = None) -> TranscriptResult:
+        """Extract transcript from YouTube video (captions, so decode_profile doesn't apply)."""
         try:
             # Extract metadata first
             metadata = self.extract_metadata(url)
@@ -98,7 +100,7 @@ class YouTubeSource(TranscriptSource):
                 raise ValueError("Could not extract video ID from URL")
             
             # Get transcript
-            api = YouTubeTranscriptApi()
+            api = YouTubeTranscriptApi(http_client=get_http_client().session)
             
             # Try to get manual transcript first, fall back to auto-generated
             try:
@@ -11,6 +11,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.podcast_processor import TranscriptProcessor
 from core.config import Config
+from core.transcription_engines import create_engine
+from core.decode_profiles import DECODE_PROFILES
 
 
 class TranscriptApp:
@@ -58,6 +60,8 @@ class TranscriptApp:
             st.session_state.result = None
         if 'source_type' not in st.session_state:
             st.session_state.source_type = "podcast"
+        if 'decode_profile' not in st.session_state:
+            st.session_state.decode_profile = Config.DECODE_PROFILE
     
     def render_sidebar(self):
         """Render sidebar with configuration and status."""
@@ -138,6 +142,16 @@ class TranscriptApp:
                 help=help_text
             )
             
+            decode_profile = st.session_state.decode_profile
+            if source_type == "podcast":
+                profiles = list(DECODE_PROFILES)
+                decode_profile = st.selectbox(
+                    "Decode profile",
+                    profiles,
+                    index=profiles.index(decode_profile) if decode_profile in profiles else 0,
+                    help="default: Whisper's own settings. fast: greedy, one pass. balanced: short temperature fallback. accurate: beam search (slowest)"
+                )
+            
             submitted = st.form_submit_button(
                 "🚀 Generate Transcript",
                 type="primary",
@@ -161,6 +175,7 @@ class TranscriptApp:
                 # Start processing
                 st.session_state.source_type = source_type
                 st.session_state.url = url
+                st.session_state.decode_profile = decode_profile
                 st.session_state.processing = True
                 st.session_state.result = None
                 st.rerun()
@@ -208,7 +223,8 @@ class TranscriptApp:
             # Final processing
             # raw_doc_path, cleaned_doc_path = self.processor.process_transcript(
             raw_doc, cleaned_doc = self.processor.process_transcript(
-                st.session_state.source_type, st.session_state.url
+                st.session_state.source_type, st.session_state.url,
+                decode_profile=st.session_state.decode_profile
             )
             
             progress_bar.progress(100)
@@ -329,6 +345,11 @@ class TranscriptApp:
 
 def main():
     """Main entry point for the Streamlit app."""
+    # Streamlit reruns this script on every interaction; the registry is per
+    # process and skips models already loaded or loading
+    if Config.MODEL_PREWARM:
+        create_engine().prewarm()
+    
     app = TranscriptApp()
     app.run()
 